@@ -162,6 +162,7 @@ async def cmd_agent(config: dict) -> dict[str, Any]:
     from opensecagent.collector.docker_collector import DockerCollector
     from opensecagent.reporter.activity import ActivityLogger
     from opensecagent.llm_agent import LLMAgent
+    from opensecagent.llm_client import aclose_clients
     act_config = {**config, "activity": config.get("activity", {}), "agent": config.get("agent", {})}
     activity = ActivityLogger(act_config)
     await activity.start()
@@ -172,6 +173,7 @@ async def cmd_agent(config: dict) -> dict[str, Any]:
     context = {"host": host_inv, "docker": docker_inv}
     agent = LLMAgent(config, activity)
     result = await agent.run_agent_loop(context, None)
+    await aclose_clients()
     await activity.stop()
     return result
 
@@ -224,7 +226,10 @@ async def _send_command_report(config: dict[str, Any], command: str, result: dic
             body_lines.append("Actions taken: " + ", ".join(result["actions_taken"][:20]))
     body_lines.append("")
     body_lines.append("(Full output was printed to the terminal.)")
-    await reporter.send_run_report(subject, "\n".join(body_lines))
+    try:
+        await reporter.send_run_report(subject, "\n".join(body_lines))
+    finally:
+        await reporter.aclose()
 
 
 async def run_command_with_report(config: dict[str, Any], command: str) -> None:
@@ -664,16 +669,19 @@ async def cmd_test(config: dict[str, Any]) -> None:
     if llm.get("enabled") and llm.get("api_key"):
         print("  Testing LLM (one short completion)...")
         try:
-            from opensecagent.llm_client import chat
+            from opensecagent.llm_client import aclose_clients, chat
             model = llm.get("model") or "gpt-4o-mini"
-            out = await chat(
-                provider=llm.get("provider", "openai"),
-                model=model,
-                messages=[{"role": "user", "content": "Reply with exactly: OK"}],
-                max_tokens=10,
-                api_key=llm.get("api_key", ""),
-                base_url=llm.get("base_url") or None,
-            )
+            try:
+                out = await chat(
+                    provider=llm.get("provider", "openai"),
+                    model=model,
+                    messages=[{"role": "user", "content": "Reply with exactly: OK"}],
+                    max_tokens=10,
+                    api_key=llm.get("api_key", ""),
+                    base_url=llm.get("base_url") or None,
+                )
+            finally:
+                await aclose_clients()
             if out and "OK" in out.upper():
                 print(f"    LLM: OK (model {model})")
             else:
@@ -692,12 +700,15 @@ async def cmd_test(config: dict[str, Any]) -> None:
         try:
             from opensecagent.reporter.email_reporter import EmailReporter
             reporter = EmailReporter(notif)
-            await reporter._send_mail(
-                "[OpenSecAgent] Test email",
-                "This is a test email from OpenSecAgent. If you received this, email delivery is working.",
-                None,
-                "",
-            )
+            try:
+                await reporter._send_mail(
+                    "[OpenSecAgent] Test email",
+                    "This is a test email from OpenSecAgent. If you received this, email delivery is working.",
+                    None,
+                    "",
+                )
+            finally:
+                await reporter.aclose()
             print("    Email: sent (check your inbox)")
         except Exception as e:
             print(f"    Email: FAILED — {e}")
@@ -200,6 +200,7 @@ def _default_config() -> dict[str, Any]:
             "run_on_incident": True,
             "run_interval_sec": 0,
             "agent_max_iterations": 10,
+            "command_timeout_sec": 120,
         },
     }
 
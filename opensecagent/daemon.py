@@ -19,6 +19,8 @@ from opensecagent.reporter.activity import ActivityLogger
 from opensecagent.reporter.manager import ReporterManager
 from opensecagent.llm_advisor import LLMAdvisor
 from opensecagent.llm_agent import LLMAgent
+from opensecagent.llm_client import aclose_clients
+from opensecagent.threat_registry import ThreatWriter
 
 logger = logging.getLogger("opensecagent")
 
@@ -61,6 +63,7 @@ class Daemon:
         self._policy = PolicyEngine(config)
         self._responder = Responder(config, self._audit, self._activity)
         self._reporter = ReporterManager(config, self._audit)
+        self._threat_writer = ThreatWriter() if config.get("threat_registry", {}).get("fsync") else None
         self._detector_manager = DetectorManager(config, self._audit)
         self._host_collector = HostCollector(config)
         self._docker_collector = DockerCollector(config)
@@ -81,6 +84,8 @@ class Daemon:
         await self._audit.start()
         await self._activity.start()
         await self._reporter.start()
+        if self._threat_writer:
+            await self._threat_writer.start()
         try:
             # One host collect
             try:
@@ -126,6 +131,9 @@ class Daemon:
             logger.info("Processed %d events", processed)
         finally:
             await self._reporter.cleanup()
+            await aclose_clients()
+            if self._threat_writer:
+                await self._threat_writer.stop()
             await self._activity.stop()
             await self._audit.stop()
         logger.info("OpenSecAgent run-one-cycle done")
@@ -137,6 +145,8 @@ class Daemon:
         await self._audit.start()
         await self._activity.start()
         await self._reporter.start()
+        if self._threat_writer:
+            await self._threat_writer.start()
 
         tasks = [
             asyncio.create_task(self._run_collectors()),
@@ -157,6 +167,9 @@ class Daemon:
             except asyncio.CancelledError:
                 pass
         await self._reporter.cleanup()
+        await aclose_clients()
+        if self._threat_writer:
+            await self._threat_writer.stop()
         await self._activity.stop()
         await self._audit.stop()
         logger.info("OpenSecAgent daemon stopped")
@@ -175,12 +188,12 @@ class Daemon:
                     self._last_host_inv = inv
                     duration = time.perf_counter() - t0
                     summary = f"hostname={inv.get('hostname','')} packages={len(inv.get('packages',[]))} ports={len(inv.get('listening_ports',[]))}"
-                    await self._activity.log_collector_run("host", started, duration, summary, None)
+                    self._activity.log_collector_run("host", started, duration, summary, None)
                     for e in self._normalizer.host_inventory_to_events(inv):
                         await self._event_queue.put(e)  # type: ignore
                 except Exception as e:
                     logger.exception("Host collector error: %s", e)
-                    await self._activity.log_collector_run("host", "", 0, "", str(e))
+                    self._activity.log_collector_run("host", "", 0, "", str(e))
             if docker_t <= 0:
                 docker_t = docker_ival
                 try:
@@ -190,12 +203,12 @@ class Daemon:
                     self._last_docker_inv = inv
                     duration = time.perf_counter() - t0
                     summary = f"containers={len(inv.get('containers',[]))} images={len(inv.get('images',[]))}"
-                    await self._activity.log_collector_run("docker", started, duration, summary, None)
+                    self._activity.log_collector_run("docker", started, duration, summary, None)
                     for e in self._normalizer.docker_inventory_to_events(inv):
                         await self._event_queue.put(e)  # type: ignore
                 except Exception as e:
                     logger.exception("Docker collector error: %s", e)
-                    await self._activity.log_collector_run("docker", "", 0, "", str(e))
+                    self._activity.log_collector_run("docker", "", 0, "", str(e))
             await asyncio.sleep(min(30, host_t, docker_t))
             host_t -= 30
             docker_t -= 30
@@ -209,12 +222,12 @@ class Daemon:
                 events = await self._drift_monitor.check()
                 duration = time.perf_counter() - t0
                 summary = f"events={len(events)}"
-                await self._activity.log_collector_run("drift", started, duration, summary, None)
+                self._activity.log_collector_run("drift", started, duration, summary, None)
                 for e in events:
                     await self._event_queue.put(e)  # type: ignore
             except Exception as e:
                 logger.exception("Drift monitor error: %s", e)
-                await self._activity.log_collector_run("drift", "", 0, "", str(e))
+                self._activity.log_collector_run("drift", "", 0, "", str(e))
             await asyncio.sleep(ival)
 
     async def _run_event_processor(self) -> None:
@@ -234,9 +247,9 @@ class Daemon:
         logger.info("Incident: %s %s", incident.severity.value, incident.title[:60])
         if self._llm._enabled:
             incident.llm_summary = await self._llm.summarize_incident(incident)
-        await self._audit.log_incident(incident)
+        self._audit.log_incident(incident)
         allowed = self._policy.allowed_actions(incident)
-        await self._activity.log_policy_decision(
+        self._activity.log_policy_decision(
             incident.incident_id,
             incident.severity.value,
             [a.get("action", "") for a in allowed],
@@ -263,6 +276,7 @@ class Daemon:
                 severity=incident.severity.value,
                 evidence=dict(incident.evidence_summary or {}),
                 resolution_actions=None,
+                writer=self._threat_writer,
             )
             first_ev = incident.events[0] if incident.events else None
             incident_ctx = {
@@ -283,7 +297,7 @@ class Daemon:
             incident.llm_summary = (incident.llm_summary or "") + f"\n[Agent] {result.get('summary', '')}"
             actions_taken = result.get("actions_taken") or []
             if actions_taken:
-                mark_resolved(self.config, threat_id, actions_taken)
+                mark_resolved(self.config, threat_id, actions_taken, writer=self._threat_writer)
                 await self._reporter.send_resolution_notification(
                     threat_id,
                     incident.title,
@@ -301,7 +315,7 @@ class Daemon:
                 events = await self._detector_manager.run_detectors()
                 duration = time.perf_counter() - t0
                 event_types = list({e.get("event_type", "") for e in events})
-                await self._activity.log_detector_run("manager", len(events), event_types, duration)
+                self._activity.log_detector_run("manager", len(events), event_types, duration)
                 logger.info("Detector run: %d events %s (%.2fs)", len(events), event_types or ["(none)"], duration)
                 for e in events:
                     await self._event_queue.put(e)  # type: ignore
@@ -337,6 +351,7 @@ class Daemon:
                         severity=finding.get("severity", "P2"),
                         evidence=finding.get("evidence") or {},
                         resolution_actions=None,
+                        writer=self._threat_writer,
                     )
                     data_dir = Path(self.config.get("agent", {}).get("data_dir", "/var/lib/opensecagent"))
                     reports_dir = self.config.get("reports", {}).get("dir") or str(data_dir / "reports")
@@ -346,6 +361,7 @@ class Daemon:
                         threat_id,
                         str(pdf_path),
                         host_context={"hostname": self._last_host_inv.get("hostname"), "os": "", "os_release": ""},
+                        max_evidence_rows=self.config.get("reports", {}).get("max_evidence_rows", 20),
                     )
                     await self._reporter.send_vulnerability_alert(finding, threat_id, str(pdf_path))
             except Exception as e:
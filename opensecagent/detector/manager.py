@@ -37,7 +37,8 @@ class DetectorManager:
         self._last_docker_inv: dict[str, Any] = {}
         self._last_ports: set[str] = set()
         self._last_containers: set[str] = set()
-        self._last_sudo_users: set[str] = set()
+        self._current_sudo: frozenset[str] = frozenset()
+        self._last_sudo_users: frozenset[str] = frozenset()
 
     def ingest_inventory(self, event: dict[str, Any]) -> None:
         src = event.get("source")
@@ -45,7 +46,8 @@ class DetectorManager:
         if src == "host_collector":
             self._last_host_inv = raw
             self._last_ports = {str(p.get("port", p.get("address", ""))) for p in raw.get("listening_ports", [])}
-            self._last_sudo_users = set(raw.get("users_with_sudo", []))
+            self._current_sudo = frozenset(raw.get("users_with_sudo", []))
+            self._last_sudo_users = self._current_sudo
         elif src == "docker_collector":
             self._last_docker_inv = raw
             self._last_containers = {c.get("id", "") for c in raw.get("containers", [])}
@@ -56,7 +58,8 @@ class DetectorManager:
         self._last_docker_inv = docker_inv or self._last_docker_inv
         self._last_ports = {str(p.get("port", p.get("address", ""))) for p in self._last_host_inv.get("listening_ports", [])}
         self._last_containers = {c.get("id", "") for c in self._last_docker_inv.get("containers", [])}
-        self._last_sudo_users = set(self._last_host_inv.get("users_with_sudo", []))
+        self._current_sudo = frozenset(self._last_host_inv.get("users_with_sudo", []))
+        self._last_sudo_users = self._current_sudo
 
     def correlate_and_classify(self, event: dict[str, Any]) -> Incident | None:
         event_type = event.get("event_type")
@@ -146,10 +149,10 @@ class DetectorManager:
             self._last_containers = {c.get("id", "") for c in self._last_docker_inv.get("containers", [])}
         # New admin user
         if self._last_host_inv:
-            user_ev = self._users.check(self._last_host_inv, self._last_sudo_users)
+            user_ev = self._users.check(self._current_sudo, self._last_sudo_users)
             if user_ev:
                 events.append(user_ev)
-            self._last_sudo_users = set(self._last_host_inv.get("users_with_sudo", []))
+            self._last_sudo_users = self._current_sudo
         # Resource usage (CPU, memory)
         resource_evs = await self._resources.check()
         events.extend(resource_evs)
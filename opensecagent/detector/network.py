@@ -5,15 +5,18 @@ import asyncio
 import time
 from typing import Any
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 logger = __import__("logging").getLogger("opensecagent.detector.network")
 
 
 def _sample_network_rate_mb_per_sec(threshold_mb: float) -> list[dict[str, Any]]:
     """Sample net I/O over ~2s; emit event if rate exceeds threshold. Run in executor."""
     events: list[dict[str, Any]] = []
-    try:
-        import psutil
-    except ImportError:
+    if psutil is None:
         return []
     try:
         c0 = psutil.net_io_counters()
@@ -2,37 +2,147 @@
 from __future__ import annotations
 
 import asyncio
+import time
 from typing import Any
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from opensecagent.models import stable_event_id
+
 logger = __import__("logging").getLogger("opensecagent.detector.resources")
 
+_SNAPSHOT_TTL_SEC = 0.5
+# Minimum CPU measurement window; one-shot runs (CLI detect, first daemon tick) wait out the rest in the worker thread.
+_CPU_WARMUP_SEC = 1.0
 
-def _sample_resources(cpu_threshold: float, mem_threshold: float) -> list[dict[str, Any]]:
-    """Sync helper to sample CPU/memory (run in executor)."""
-    try:
-        import psutil
-    except ImportError:
-        return []
-    events: list[dict[str, Any]] = []
-    try:
-        cpu = psutil.cpu_percent(interval=1)
-        if cpu >= cpu_threshold:
-            raw: dict[str, Any] = {"cpu_percent": cpu, "threshold": cpu_threshold}
+
+def _busy_times(times: Any) -> tuple[float, float]:
+    """(total, busy) seconds of a cpu_times() sample, counted as psutil.cpu_percent does."""
+    total = sum(times) - getattr(times, "guest", 0.0) - getattr(times, "guest_nice", 0.0)
+    return total, total - times.idle - getattr(times, "iowait", 0.0)
+
+
+def _busy_percent(before: Any, after: Any) -> float:
+    """System-wide CPU % between two cpu_times() samples."""
+    total0, busy0 = _busy_times(before)
+    total1, busy1 = _busy_times(after)
+    if total1 <= total0:
+        return 0.0
+    return round(min(100.0, max(0.0, (busy1 - busy0) / (total1 - total0) * 100)), 1)
+
+
+class ResourceDetector:
+    """Emit events when CPU or memory usage exceeds configured thresholds."""
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        self.config = config
+        det = config.get("detector", {})
+        self._cpu_percent = det.get("resource_cpu_percent", 90)
+        self._memory_percent = det.get("resource_memory_percent", 90)
+        self._enabled = det.get("resource_detector_enabled", True)
+        self._proc_cache: dict[int, Any] = {}
+        self._last_snapshot: tuple[float, tuple[float, float, int]] | None = None
+        # Monotonic time and psutil.cpu_times() of the last system-wide read; usage is measured from there.
+        # Kept here rather than in psutil.cpu_percent(None), whose baseline is per thread and so lost
+        # between to_thread workers.
+        self._cpu_sampled_at = time.monotonic()
+        self._cpu_times = psutil.cpu_times() if psutil is not None else None
+
+    def _warmup_remaining(self) -> float:
+        """Seconds left before the window since the last CPU read reaches _CPU_WARMUP_SEC."""
+        return max(0.0, _CPU_WARMUP_SEC - (time.monotonic() - self._cpu_sampled_at))
+
+    async def check(self) -> list[dict[str, Any]]:
+        if not self._enabled:
+            return []
+        return await asyncio.to_thread(self._sample_resources)
+
+    def _snapshot(self) -> tuple[float, float, int]:
+        """(cpu %, memory %, available bytes) in one pass; reused for 0.5 s so callers within a tick share it."""
+        now = time.monotonic()
+        if self._last_snapshot is not None and now - self._last_snapshot[0] < _SNAPSHOT_TTL_SEC:
+            return self._last_snapshot[1]
+        time.sleep(self._warmup_remaining())
+        times = psutil.cpu_times()
+        cpu = _busy_percent(self._cpu_times, times)
+        self._cpu_times = times
+        self._cpu_sampled_at = time.monotonic()
+        mem = psutil.virtual_memory()
+        snap = (cpu, mem.percent, mem.available)
+        self._last_snapshot = (self._cpu_sampled_at, snap)
+        return snap
+
+    def _top_processes(self, limit: int = 10) -> list[dict[str, Any]]:
+        """Rank processes by CPU since the previous tick. Handles are cached across ticks so that
+        cpu_percent(None) returns a real delta; only PIDs new since the last tick get a Process
+        handle (seeded now, reported from the next tick), and exited PIDs are dropped. The first call
+        seeds every process and waits out the CPU warm-up, so one-shot runs still get a ranking."""
+        current = set(psutil.pids())
+        cache = self._proc_cache
+        for pid in cache.keys() - current:
+            del cache[pid]
+        new_pids = current - cache.keys()
+        if not cache:
+            self._seed_processes(new_pids)
+            new_pids = set()
+            time.sleep(self._warmup_remaining())
+        usage: list[tuple[float, Any]] = []
+        for pid, handle in list(cache.items()):
+            try:
+                cpu_p = handle.cpu_percent(None)
+            except psutil.NoSuchProcess:
+                del cache[pid]
+                continue
+            except psutil.AccessDenied:
+                continue
+            if cpu_p > 0:
+                usage.append((cpu_p, handle))
+        self._seed_processes(new_pids)
+        usage.sort(key=lambda x: x[0], reverse=True)
+        top: list[dict[str, Any]] = []
+        for cpu_p, handle in usage[:limit]:
+            try:
+                with handle.oneshot():
+                    top.append({"pid": handle.pid, "name": handle.name(), "cpu_percent": round(cpu_p, 1), "cmdline": handle.cmdline()[:5]})
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return top
+
+    def _seed_processes(self, pids: set[int]) -> None:
+        """Create and cache Process handles, priming their CPU counters."""
+        for pid in pids:
             try:
-                procs = list(psutil.process_iter(attrs=["pid", "name", "cmdline"]))
-                top_by_cpu: list[dict[str, Any]] = []
-                for p in procs[:80]:
-                    try:
-                        cpu_p = p.cpu_percent(interval=0)
-                        if cpu_p > 0:
-                            top_by_cpu.append({"pid": p.info.get("pid"), "name": p.info.get("name"), "cpu_percent": round(cpu_p, 1), "cmdline": (p.info.get("cmdline") or [])[:5]})
-                    except (psutil.NoSuchProcess, psutil.AccessDenied):
-                        continue
-                raw["top_processes"] = sorted(top_by_cpu, key=lambda x: x.get("cpu_percent", 0), reverse=True)[:10]
-            except Exception:
-                pass
+                p = psutil.Process(pid)
+                p.cpu_percent(None)
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+            self._proc_cache[pid] = p
+
+    def _sample_resources(self) -> list[dict[str, Any]]:
+        """Sync helper to sample CPU/memory (run in executor)."""
+        cpu_threshold = self._cpu_percent
+        mem_threshold = self._memory_percent
+        if psutil is None:
+            return []
+        events: list[dict[str, Any]] = []
+        try:
+            # Sampled every tick so cached per-process CPU counters stay warm.
+            top_processes = self._top_processes()
+        except Exception as e:
+            logger.debug("Process sampling failed: %s", e)
+            top_processes = []
+        try:
+            cpu, mem_percent, mem_available = self._snapshot()
+        except Exception as e:
+            logger.debug("Resource snapshot failed: %s", e)
+            return events
+        if cpu >= cpu_threshold:
+            raw: dict[str, Any] = {"cpu_percent": cpu, "threshold": cpu_threshold, "top_processes": top_processes}
             events.append({
-                "event_id": f"resource-cpu-{id(cpu_threshold) % 2**32}",
+                "event_id": stable_event_id("resource-cpu", "detector.resources", "high_cpu", cpu_threshold),
                 "source": "detector.resources",
                 "event_type": "high_cpu",
                 "severity": "P2",
@@ -41,47 +151,19 @@ def _sample_resources(cpu_threshold: float, mem_threshold: float) -> list[dict[s
                 "asset_ids": ["host"],
                 "confidence": min(1.0, cpu / 100),
             })
-    except Exception as e:
-        logger.debug("CPU check failed: %s", e)
-    try:
-        mem = psutil.virtual_memory()
-        if mem.percent >= mem_threshold:
+        if mem_percent >= mem_threshold:
             events.append({
-                "event_id": f"resource-mem-{id(mem_threshold) % 2**32}",
+                "event_id": stable_event_id("resource-mem", "detector.resources", "high_memory", mem_threshold),
                 "source": "detector.resources",
                 "event_type": "high_memory",
                 "severity": "P2",
-                "summary": f"High memory usage: {mem.percent:.1f}% (threshold {mem_threshold}%)",
+                "summary": f"High memory usage: {mem_percent:.1f}% (threshold {mem_threshold}%)",
                 "raw": {
-                    "memory_percent": mem.percent,
+                    "memory_percent": mem_percent,
                     "threshold": mem_threshold,
-                    "available_mb": mem.available // (1024 * 1024),
+                    "available_mb": mem_available // (1024 * 1024),
                 },
                 "asset_ids": ["host"],
-                "confidence": min(1.0, mem.percent / 100),
+                "confidence": min(1.0, mem_percent / 100),
             })
-    except Exception as e:
-        logger.debug("Memory check failed: %s", e)
-    return events
-
-
-class ResourceDetector:
-    """Emit events when CPU or memory usage exceeds configured thresholds."""
-
-    def __init__(self, config: dict[str, Any]) -> None:
-        self.config = config
-        det = config.get("detector", {})
-        self._cpu_percent = det.get("resource_cpu_percent", 90)
-        self._memory_percent = det.get("resource_memory_percent", 90)
-        self._enabled = det.get("resource_detector_enabled", True)
-
-    async def check(self) -> list[dict[str, Any]]:
-        if not self._enabled:
-            return []
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None,
-            _sample_resources,
-            self._cpu_percent,
-            self._memory_percent,
-        )
+        return events
@@ -3,24 +3,26 @@ from __future__ import annotations
 
 from typing import Any
 
+from opensecagent.models import stable_event_id
+
 
 class NewAdminUserDetector:
     def __init__(self, config: dict[str, Any]) -> None:
         self.config = config
 
-    def check(self, host_inv: dict[str, Any], last_sudo_users: set[str]) -> dict[str, Any] | None:
-        current = set(host_inv.get("users_with_sudo", []))
-        new_admins = current - last_sudo_users
+    def check(self, current_sudo: frozenset[str], last_sudo_users: frozenset[str]) -> dict[str, Any] | None:
+        """current_sudo is built once per inventory by the caller; no per-tick set rebuild here."""
+        new_admins = current_sudo - last_sudo_users
         if not last_sudo_users:
             return None
         if new_admins:
             return {
-                "event_id": f"new-admin-{hash(frozenset(new_admins)) % 2**32}",
+                "event_id": stable_event_id("new-admin", sorted(new_admins)),
                 "source": "detector.users",
                 "event_type": "new_admin_user",
                 "severity": "P2",
                 "summary": f"New admin (sudo) user(s) detected: {', '.join(sorted(new_admins))}",
-                "raw": {"new_users": list(new_admins), "current_sudo": list(current)},
+                "raw": {"new_users": list(new_admins), "current_sudo": list(current_sudo)},
                 "asset_ids": ["host"],
                 "confidence": 1.0,
             }
@@ -5,17 +5,33 @@ import re
 import logging
 from typing import Any
 
+from opensecagent.llm_client import chat
 from opensecagent.models import Incident
 
+try:
+    import re2 as _re  # google-re2: linear-time DFA matching, no backtracking
+except ImportError:
+    _re = re
+
 logger = logging.getLogger("opensecagent.llm")
 
 
-def redact(text: str, patterns: list[str]) -> str:
-    out = text
-    for pat in patterns:
-        out = re.sub(re.escape(pat), "[REDACTED]", out, flags=re.I)
-    out = re.sub(r"(?i)(password|secret|token|api[_-]?key|credential)\s*[:=]\s*\S+", r"\1=[REDACTED]", out)
-    return out
+_KEYVAL_RE = _re.compile(r"(?i)(password|secret|token|api[_-]?key|credential)\s*[:=]\s*\S+")
+# Lowercase literals that must appear in text for _KEYVAL_RE to match ("api" covers api_key/api-key/apikey).
+_KEYVAL_NEEDLES = ("password", "secret", "token", "api", "credential")
+
+
+def compile_redact_patterns(patterns: list[str]) -> re.Pattern[str] | None:
+    """Fuse literal redaction patterns into one case-insensitive alternation (longest first)."""
+    literals = sorted({p for p in patterns if p}, key=len, reverse=True)
+    if not literals:
+        return None
+    return re.compile("|".join(re.escape(p) for p in literals), re.I)
+
+
+def redact(text: str, pattern_re: re.Pattern[str] | None) -> str:
+    out = pattern_re.sub("[REDACTED]", text) if pattern_re is not None else text
+    return _KEYVAL_RE.sub(r"\1=[REDACTED]", out)
 
 
 class LLMAdvisor:
@@ -29,12 +45,21 @@ class LLMAdvisor:
         self._model = self.config.get("model", "gpt-4o-mini")
         self._base_url = self.config.get("base_url", "")
         self._redact_patterns = self.config.get("redact_patterns", ["password", "secret", "token", "key"])
+        self._redact_re = compile_redact_patterns(self._redact_patterns)
+        self._redact_needles = tuple({p.lower() for p in self._redact_patterns if p}) + _KEYVAL_NEEDLES
+
+    def _redact(self, text: str) -> str:
+        """redact() with a fast path: benign text (no needle present) is returned without any regex pass."""
+        low = text.lower()
+        if not any(n in low for n in self._redact_needles):
+            return text
+        return redact(text, self._redact_re)
 
     async def summarize_incident(self, incident: Incident) -> str:
         if not self._enabled or not self._api_key:
             return ""
-        safe_narrative = redact(incident.narrative, self._redact_patterns)
-        safe_evidence = {k: redact(str(v), self._redact_patterns) for k, v in (incident.evidence_summary or {}).items()}
+        safe_narrative = self._redact(incident.narrative)
+        safe_evidence = {k: self._redact(str(v)) for k, v in (incident.evidence_summary or {}).items()}
         prompt = (
             "You are a defensive security assistant. Summarize this security incident in 2-3 clear sentences "
             "for a system administrator. Do NOT suggest exploits or offensive actions. Only defensive remediation.\n\n"
@@ -47,7 +72,6 @@ class LLMAdvisor:
             return ""
 
     async def _call_llm(self, prompt: str) -> str:
-        from opensecagent.llm_client import chat
         return await chat(
             provider=self._provider,
             model=self._model,
@@ -4,9 +4,19 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import shlex
 import time
 from typing import Any
 
+from opensecagent.llm_client import chat
+from opensecagent.prompts import get_system_prompt
+from opensecagent.threat_registry import load_threats_for_context_async
+
+try:
+    import re2 as _re  # google-re2: linear-time DFA matching, no backtracking
+except ImportError:
+    _re = re
+
 logger = __import__("logging").getLogger("opensecagent.llm_agent")
 
 # Allowed commands: (regex pattern, allow_shell). Shell=false means exec-style (no shell expansion).
@@ -63,16 +73,70 @@ ALLOWED_COMMANDS = [
     (r"^iptables\s+-I\s+INPUT\s+", False),
 ]
 
+# Whitelist fused into a single anchored alternation, compiled once at import (RE2 when available).
+_ALLOWED_RE = _re.compile("(?i)^(?:" + "|".join(f"(?:{p.lstrip('^')})" for p, _ in ALLOWED_COMMANDS) + ")")
+_CODEBLOCK_RE = re.compile(r"```(?:bash|sh)?\s*\n(.*?)```", re.DOTALL)
+
 
 def is_command_allowed(cmd: str) -> bool:
     """Check if command is in whitelist."""
     cmd = cmd.strip()
     if not cmd or cmd.startswith("#"):
         return False
-    for pattern, _ in ALLOWED_COMMANDS:
-        if re.search(pattern, cmd, re.I):
-            return True
-    return False
+    return _ALLOWED_RE.match(cmd) is not None
+
+
+_DECODER = json.JSONDecoder()
+
+# Bytes of stdout/stderr kept per executed command (the rest is drained and discarded).
+_OUTPUT_CAP_BYTES = 2000
+# Messages sent per LLM call: system prompt + initial context + the most recent turns.
+_MAX_HISTORY_MESSAGES = 12
+
+
+def _extract_json(text: str) -> dict[str, Any] | None:
+    """Return the first JSON object embedded in text (linear scan, no regex backtracking)."""
+    i = text.find("{")
+    while i != -1:
+        try:
+            return _DECODER.raw_decode(text, i)[0]
+        except json.JSONDecodeError:
+            i = text.find("{", i + 1)
+    return None
+
+
+def _bounded_dumps(obj: Any, limit: int = 8000) -> str:
+    """Same as json.dumps(obj, indent=2)[:limit], but stops encoding once limit chars are produced."""
+    parts: list[str] = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=2).iterencode(obj):
+        parts.append(chunk)
+        size += len(chunk)
+        if size >= limit:
+            break
+    return "".join(parts)[:limit]
+
+
+async def _read_capped(stream: asyncio.StreamReader, limit: int = _OUTPUT_CAP_BYTES) -> bytes:
+    """Read a pipe to EOF keeping only the first limit bytes, so huge output costs neither memory nor decode."""
+    head = bytearray()
+    while True:
+        chunk = await stream.read(65536)
+        if not chunk:
+            break
+        if len(head) < limit:
+            head += chunk[: limit - len(head)]
+    return bytes(head)
+
+
+def _trim_history(messages: list[dict[str, str]], max_messages: int = _MAX_HISTORY_MESSAGES) -> list[dict[str, str]]:
+    """Keep the system prompt, the initial context and the latest whole turns (starting at an assistant reply)."""
+    if len(messages) <= max_messages:
+        return messages
+    tail = messages[-(max_messages - 2):]
+    while tail and tail[0].get("role") != "assistant":
+        tail = tail[1:]
+    return messages[:2] + tail
 
 
 def parse_llm_commands(response: str) -> tuple[list[dict[str, str]], bool, dict[str, Any] | None]:
@@ -84,9 +148,8 @@ def parse_llm_commands(response: str) -> tuple[list[dict[str, str]], bool, dict[
     done = False
     finding: dict[str, Any] | None = None
     try:
-        json_match = re.search(r"\{[\s\S]*\}", response)
-        if json_match:
-            data = json.loads(json_match.group())
+        data = _extract_json(response)
+        if data is not None:
             commands = data.get("commands", [])
             if isinstance(commands, list):
                 commands = [c if isinstance(c, dict) else {"cmd": str(c), "reason": ""} for c in commands]
@@ -98,7 +161,7 @@ def parse_llm_commands(response: str) -> tuple[list[dict[str, str]], bool, dict[
     except (json.JSONDecodeError, KeyError, TypeError):
         pass
     if not commands:
-        for block in re.findall(r"```(?:bash|sh)?\s*\n(.*?)```", response, re.DOTALL):
+        for block in _CODEBLOCK_RE.findall(response):
             for line in block.strip().split("\n"):
                 line = line.strip()
                 if line and not line.startswith("#"):
@@ -126,6 +189,12 @@ class LLMAgent:
         self._redact_patterns = self.config.get("redact_patterns", ["password", "secret", "token", "key"])
         self._activity = activity_logger
         self._run_as = (config.get("execution", {}) or {}).get("run_as")
+        self._command_timeout = agent_cfg.get("command_timeout_sec", 120)
+
+    async def _get_system_prompt(self, mode: str) -> str:
+        """System prompt for mode with current past-threat context (the loader and composer are both cached)."""
+        threat_context = await load_threats_for_context_async(self._full_config, limit=15)
+        return get_system_prompt(mode, threat_context, self._full_config)
 
     def _get_model_for_mode(self, mode: str) -> str:
         """Select model by mode: scan uses cheaper model, resolve uses advanced model."""
@@ -146,15 +215,11 @@ class LLMAgent:
         if not self._enabled or not self._api_key:
             return {"iterations": 0, "commands_executed": 0, "summary": "LLM agent disabled"}
 
-        from opensecagent.threat_registry import load_threats_for_context
-        from opensecagent.prompts import get_system_prompt
-
-        threat_context = load_threats_for_context(self._full_config, limit=15)
-        system_prompt = get_system_prompt(mode, threat_context, self._full_config)
+        system_prompt = await self._get_system_prompt(mode)
         messages: list[dict[str, str]] = [{"role": "system", "content": system_prompt}]
         current_model = self._get_model_for_mode(mode)
 
-        user_context = f"System context:\n{json.dumps(context, indent=2)[:8000]}\n"
+        user_context = f"System context:\n{_bounded_dumps(context, 8000)}\n"
         if incident:
             user_context += f"\nIncident to address: {incident.title}\n{incident.narrative}\n"
         if mode == "scan":
@@ -176,35 +241,39 @@ class LLMAgent:
             except Exception as e:
                 logger.warning("LLM agent call failed: %s", e)
                 if self._activity:
-                    await self._activity.log_llm_call(
+                    self._activity.log_llm_call(
                         "agent_loop", None, None, time.perf_counter() - t0, False, str(e)
                     )
                 break
 
             if self._activity:
-                await self._activity.log_llm_call(
+                self._activity.log_llm_call(
                     "agent_loop", None, None, time.perf_counter() - t0, True, None
                 )
 
             commands, done, parsed_finding = parse_llm_commands(response)
             if parsed_finding:
                 finding = parsed_finding
-            executed = 0
-
-            for c in commands:
-                cmd = c.get("cmd", "").strip()
-                if not cmd or not is_command_allowed(cmd):
-                    continue
-                result = await self._execute_command(cmd)
-                executed += 1
-                total_commands += 1
-                actions_taken.append(cmd)
+            allowed = [cmd for cmd in (c.get("cmd", "").strip() for c in commands) if cmd and is_command_allowed(cmd)]
+            if mode == "scan":
+                # Scan commands are read-only and independent: overlap their subprocess I/O.
+                results = await asyncio.gather(*(self._execute_command(cmd) for cmd in allowed))
+            else:
+                # Remediation steps may depend on each other (kill, then uninstall, then rm): keep order.
+                results = [await self._execute_command(cmd) for cmd in allowed]
+            executed = len(allowed)
+            total_commands += executed
+            actions_taken.extend(allowed)
+            if allowed:
                 messages.append({"role": "assistant", "content": response})
-                result_text = f"Command: {cmd}\nExit: {result['exit_code']}\nStdout: {result['stdout'][:1500]}\nStderr: {result['stderr'][:500]}"
+                result_text = "\n\n".join(
+                    f"Command: {cmd}\nExit: {result['exit_code']}\nStdout: {result['stdout'][:1500]}\nStderr: {result['stderr'][:500]}"
+                    for cmd, result in zip(allowed, results)
+                )
                 messages.append({"role": "user", "content": result_text})
 
             if self._activity:
-                await self._activity.log_agent_iteration(
+                self._activity.log_agent_iteration(
                     iteration, len(commands), executed, done, f"Executed {executed} commands"
                 )
 
@@ -215,6 +284,7 @@ class LLMAgent:
                 "role": "user",
                 "content": "Based on the command outputs above, suggest next commands or set done: true. Return JSON only.",
             })
+            messages = _trim_history(messages)
 
         out = {
             "iterations": iteration,
@@ -230,16 +300,25 @@ class LLMAgent:
     async def _execute_command(self, cmd: str) -> dict[str, Any]:
         """Execute a whitelisted command (with optional run_as)."""
         t0 = time.perf_counter()
-        run_cmd = cmd
-        if self._run_as:
-            run_cmd = f"sudo -u {self._run_as} {cmd}"
         try:
-            proc = await asyncio.create_subprocess_shell(
-                run_cmd,
+            # No shell: argv is tokenized here, so pipes, ';' or globs in LLM output are never interpreted.
+            argv = shlex.split(cmd)
+            if self._run_as:
+                argv = ["sudo", "-u", str(self._run_as)] + argv
+            proc = await asyncio.create_subprocess_exec(
+                *argv,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
             )
-            stdout, stderr = await proc.communicate()
+            try:
+                stdout, stderr, _ = await asyncio.wait_for(
+                    asyncio.gather(_read_capped(proc.stdout), _read_capped(proc.stderr), proc.wait()),
+                    timeout=self._command_timeout,
+                )
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+                raise TimeoutError(f"command timed out after {self._command_timeout}s")
             exit_code = proc.returncode or 0
             out = stdout.decode("utf-8", errors="replace")
             err = stderr.decode("utf-8", errors="replace")
@@ -250,14 +329,13 @@ class LLMAgent:
         duration = time.perf_counter() - t0
 
         if self._activity:
-            await self._activity.log_command_execution(
+            self._activity.log_command_execution(
                 cmd, exit_code, out, err, duration, source="llm_agent"
             )
 
         return {"exit_code": exit_code, "stdout": out, "stderr": err}
 
     async def _call_llm(self, messages: list[dict[str, str]], model: str | None = None) -> str:
-        from opensecagent.llm_client import chat
         model = model or self._model
         return await chat(
             provider=self._provider,
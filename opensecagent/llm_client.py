@@ -1,8 +1,53 @@
 # OpenSecAgent - LLM client: OpenAI and Anthropic with unified interface
 from __future__ import annotations
 
+import asyncio
 from typing import Any
 
+try:
+    from openai import AsyncOpenAI
+except ImportError:
+    AsyncOpenAI = None
+try:
+    from anthropic import AsyncAnthropic
+except ImportError:
+    AsyncAnthropic = None
+
+# SDK clients keyed by (event loop, provider, api_key, base_url). Reusing them keeps the underlying
+# httpx connection pool alive between calls; the loop is part of the key because pooled
+# connections cannot outlive the loop that opened them (the CLI runs one loop per command).
+_clients: dict[tuple[Any, ...], Any] = {}
+
+
+def _get_client(provider: str, api_key: str, base_url: str | None) -> Any:
+    loop = asyncio.get_running_loop()
+    for stale in [k for k in _clients if k[0].is_closed()]:
+        del _clients[stale]
+    key = (loop, provider, api_key, base_url)
+    client = _clients.get(key)
+    if client is None:
+        if provider == "anthropic":
+            if AsyncAnthropic is None:
+                raise ImportError("anthropic package is not installed")
+            client = AsyncAnthropic(api_key=api_key)
+        else:
+            if AsyncOpenAI is None:
+                raise ImportError("openai package is not installed")
+            client = AsyncOpenAI(api_key=api_key, base_url=base_url or None)
+        _clients[key] = client
+    return client
+
+
+async def aclose_clients() -> None:
+    """Close cached LLM clients bound to the running loop (call on daemon/CLI shutdown)."""
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _clients if k[0] is loop]:
+        client = _clients.pop(key)
+        try:
+            await client.close()
+        except Exception:
+            pass
+
 
 async def chat(
     provider: str,
@@ -34,8 +79,7 @@ async def _chat_openai(
     api_key: str,
     base_url: str | None,
 ) -> str:
-    from openai import AsyncOpenAI
-    client = AsyncOpenAI(api_key=api_key, base_url=base_url or None)
+    client = _get_client("openai", api_key, base_url)
     r = await client.chat.completions.create(
         model=model,
         messages=messages,
@@ -52,7 +96,6 @@ async def _chat_anthropic(
     max_tokens: int,
     api_key: str,
 ) -> str:
-    from anthropic import AsyncAnthropic
     # Anthropic: system is separate; messages are only user/assistant
     system = ""
     conv: list[dict[str, str]] = []
@@ -67,7 +110,7 @@ async def _chat_anthropic(
             conv.append({"role": role, "content": content})
     if not conv:
         return ""
-    client = AsyncAnthropic(api_key=api_key)
+    client = _get_client("anthropic", api_key, None)
     kwargs: dict[str, Any] = {
         "model": model,
         "max_tokens": max_tokens,
@@ -41,7 +41,14 @@ def _send_error_email_to_admin(error: BaseException, context: str = "OpenSecAgen
             return
         from opensecagent.reporter.email_reporter import EmailReporter
         reporter = EmailReporter(notif)
-        asyncio.run(reporter.send_error_report(error, context))
+
+        async def send() -> None:
+            try:
+                await reporter.send_error_report(error, context)
+            finally:
+                await reporter.aclose()
+
+        asyncio.run(send())
     except Exception:
         pass
 
@@ -1,6 +1,8 @@
 # OpenSecAgent - Data models (Asset, Finding, Event, Incident, Policy)
 from __future__ import annotations
 
+import hashlib
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -31,8 +33,11 @@ class ActionTier(int, Enum):
 
 # --- Core entities ---
 
+# __slots__ storage (no per-instance __dict__) where supported; dataclass(slots=) needs Python 3.10+.
+_SLOTS: dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Asset:
     asset_type: AssetType
     id: str
@@ -41,7 +46,7 @@ class Asset:
     labels: dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Finding:
     asset_id: str
     finding_type: str
@@ -53,7 +58,7 @@ class Finding:
     ts: datetime = field(default_factory=datetime.utcnow)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Event:
     event_id: str
     source: str  # collector module name
@@ -65,8 +70,33 @@ class Event:
     asset_ids: list[str] = field(default_factory=list)
     confidence: float = 1.0
 
-
-@dataclass
+    @classmethod
+    def batch(
+        cls,
+        source: str,
+        event_type: str,
+        records: list[dict[str, Any]],
+        ts: datetime | None = None,
+    ) -> list[Event]:
+        """Build events for one collector/detector pass, sharing a single timestamp."""
+        ts = ts or datetime.utcnow()
+        return [
+            cls(
+                event_id=r.get("event_id", ""),
+                source=source,
+                event_type=event_type,
+                severity=severity_from_str(r.get("severity", "P4")),
+                summary=r.get("summary", ""),
+                raw=r.get("raw", {}),
+                ts=ts,
+                asset_ids=r.get("asset_ids", []),
+                confidence=float(r.get("confidence", 1.0)),
+            )
+            for r in records
+        ]
+
+
+@dataclass(**_SLOTS)
 class Incident:
     incident_id: str
     severity: Severity
@@ -79,17 +109,63 @@ class Incident:
     created_at: datetime = field(default_factory=datetime.utcnow)
     contained_at: datetime | None = None
     llm_summary: str = ""
+    _as_dict: dict[str, Any] | None = field(default=None, init=False, repr=False, compare=False)
+    _events_dicts: list[dict[str, Any]] | None = field(default=None, init=False, repr=False, compare=False)
+    _event_types: frozenset[str] = field(default=frozenset(), init=False, repr=False, compare=False)
 
-    def event_type_matches(self, typ: str) -> bool:
-        return typ in {e.event_type for e in self.events}
+    def __post_init__(self) -> None:
+        self._event_types = frozenset(e.event_type for e in self.events)
 
-
-@dataclass
+    def event_type_matches(self, typ: str) -> bool:
+        return typ in self._event_types
+
+    def events_as_dicts(self) -> list[dict[str, Any]]:
+        """Serialized events (id, source, type, summary), built once per incident."""
+        if self._events_dicts is None:
+            self._events_dicts = [
+                {
+                    "event_id": e.event_id,
+                    "source": e.source,
+                    "event_type": e.event_type,
+                    "summary": e.summary,
+                }
+                for e in self.events
+            ]
+        return self._events_dicts
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready form shared by the audit log and the digest. Built once per incident and
+        cached; list fields (actions_taken etc.) are shared by reference, so appends stay visible."""
+        if self._as_dict is None:
+            self._as_dict = {
+                "incident_id": self.incident_id,
+                "severity": self.severity.value,
+                "title": self.title,
+                "narrative": self.narrative,
+                "created_at": self.created_at.isoformat() + "Z",
+                "events": self.events_as_dicts(),
+                "evidence_summary": self.evidence_summary,
+                "recommended_actions": self.recommended_actions,
+                "actions_taken": self.actions_taken,
+                "llm_summary": self.llm_summary,
+            }
+        return self._as_dict
+
+
+@dataclass(**_SLOTS)
 class Policy:
     action_tier_max: ActionTier
     maintenance_windows: list[dict[str, Any]]
     allowed_containment_actions: set[str] = field(default_factory=set)
 
 
+_SEVERITY_MAP: dict[str, Severity] = {e.value: e for e in Severity}
+
+
 def severity_from_str(s: str) -> Severity:
-    return Severity(s) if s in [e.value for e in Severity] else Severity.P4
+    return _SEVERITY_MAP.get(s, Severity.P4)
+
+
+def stable_event_id(prefix: str, *parts: Any) -> str:
+    """Content-derived event id, stable across restarts (unlike id()/hash()) so repeat alerts dedupe."""
+    return f"{prefix}-{hashlib.blake2b(repr(parts).encode(), digest_size=6).hexdigest()}"
@@ -9,6 +9,7 @@ from typing import Any
 class Normalizer:
     def host_inventory_to_events(self, inv: dict[str, Any]) -> list[dict[str, Any]]:
         events: list[dict[str, Any]] = []
+        ts = datetime.utcnow().isoformat() + "Z"
         e = {
             "event_id": f"host-inv-{uuid.uuid4().hex[:12]}",
             "source": "host_collector",
@@ -16,7 +17,7 @@ class Normalizer:
             "severity": "P4",
             "summary": f"Host inventory: {inv.get('hostname', 'unknown')}",
             "raw": inv,
-            "ts": datetime.utcnow().isoformat() + "Z",
+            "ts": ts,
             "asset_ids": ["host"],
             "confidence": 1.0,
         }
@@ -27,6 +28,7 @@ class Normalizer:
         events: list[dict[str, Any]] = []
         if not inv.get("available"):
             return events
+        ts = datetime.utcnow().isoformat() + "Z"
         e = {
             "event_id": f"docker-inv-{uuid.uuid4().hex[:12]}",
             "source": "docker_collector",
@@ -34,7 +36,7 @@ class Normalizer:
             "severity": "P4",
             "summary": f"Docker: {len(inv.get('containers', []))} containers, {len(inv.get('images', []))} images",
             "raw": inv,
-            "ts": datetime.utcnow().isoformat() + "Z",
+            "ts": ts,
             "asset_ids": ["host"] + [c.get("id", "") for c in inv.get("containers", [])[:20]],
             "confidence": 1.0,
         }
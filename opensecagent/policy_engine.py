@@ -1,11 +1,57 @@
 # OpenSecAgent - Policy engine: allowed actions by tier, maintenance window
 from __future__ import annotations
 
-from datetime import datetime
+import logging
+from datetime import date, datetime, time, timezone
 from typing import Any
 
 from opensecagent.models import ActionTier, Incident
 
+try:
+    from dateutil import parser as _dateutil_parser
+except ImportError:
+    _dateutil_parser = None
+
+logger = logging.getLogger("opensecagent.policy")
+
+
+# Two distinct dateutil defaults: a value parsed to each of them had no date part of its own.
+_DEFAULT_A = datetime(2000, 1, 1)
+_DEFAULT_B = datetime(2001, 2, 2)
+
+
+def _parse_window_time(value: str) -> datetime | time:
+    """Parse a maintenance window bound to a naive UTC datetime (comparable with utcnow()), or to a
+    naive UTC time for date-less values such as "02:00", which repeat daily.
+    ISO-8601 goes through datetime/time.fromisoformat; dateutil is only a fallback for other formats."""
+    value = str(value).strip()
+    iso = value[:-1] + "+00:00" if value.endswith("Z") else value
+    try:
+        dt = datetime.fromisoformat(iso)
+    except ValueError:
+        try:
+            return _utc_time(time.fromisoformat(iso))
+        except ValueError:
+            pass
+        if _dateutil_parser is None:
+            raise ValueError(f"not ISO-8601 and python-dateutil is not installed: {value!r}") from None
+        dt = _dateutil_parser.parse(value, default=_DEFAULT_A)
+        other = _dateutil_parser.parse(value, default=_DEFAULT_B)
+        if dt.date() != other.date():
+            if (dt.date(), other.date()) != (_DEFAULT_A.date(), _DEFAULT_B.date()):
+                raise ValueError(f"incomplete date: {value!r}")
+            return _utc_time(dt.timetz())
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def _utc_time(t: time) -> time:
+    """Naive UTC time of day for a time that may carry a fixed UTC offset."""
+    if t.tzinfo is None:
+        return t
+    return datetime.combine(date(2000, 1, 1), t).astimezone(timezone.utc).time()
+
 
 class PolicyEngine:
     def __init__(self, config: dict[str, Any]) -> None:
@@ -13,6 +59,30 @@ class PolicyEngine:
         tier = config.get("action_tier_max", 1)
         self._max_tier = ActionTier(tier) if isinstance(tier, int) else ActionTier.ALERT_ONLY
         self._maintenance_windows = config.get("maintenance_windows", [])
+        self._parsed_windows: list[tuple[datetime, datetime]] = []
+        # Date-less windows ("02:00"-"04:00"), matched against the UTC time of day on every check.
+        self._daily_windows: list[tuple[time, time]] = []
+        for w in self._maintenance_windows:
+            start = w.get("start")
+            end = w.get("end")
+            if start and end:
+                try:
+                    lo, hi = _parse_window_time(start), _parse_window_time(end)
+                    if isinstance(lo, datetime) and isinstance(hi, datetime):
+                        self._parsed_windows.append((lo, hi))
+                    elif not isinstance(lo, datetime) and not isinstance(hi, datetime):
+                        self._daily_windows.append((lo, hi))
+                    else:
+                        raise ValueError("start and end must both have a date or both be times of day")
+                except Exception as e:
+                    logger.warning("Ignoring maintenance window %s-%s: %s", start, end, e)
+        # Containment actions by triggering event type (P1/P2 only), fixed for the engine's tier.
+        self._rules: dict[str, tuple[dict[str, Any], ...]] = {}
+        if self._max_tier >= ActionTier.SOFT_CONTAINMENT:
+            self._rules = {
+                "new_container": ({"action": "stop_container", "tier": 1, "timeout_minutes": 60},),
+                "auth_failures": ({"action": "block_ip_temporary", "tier": 1, "timeout_minutes": 30},),
+            }
 
     def allowed_actions(self, incident: Incident) -> list[dict[str, Any]]:
         actions: list[dict[str, Any]] = []
@@ -20,27 +90,16 @@ class PolicyEngine:
             actions.append({"action": "alert_only", "reason": "maintenance_window"})
             return actions
         actions.append({"action": "alert_only", "reason": "always"})
-        if self._max_tier >= ActionTier.SOFT_CONTAINMENT and incident.severity.value in ("P1", "P2"):
-            if incident.event_type_matches("new_container"):
-                actions.append({"action": "stop_container", "tier": 1, "timeout_minutes": 60})
-            if incident.event_type_matches("auth_failures"):
-                actions.append({"action": "block_ip_temporary", "tier": 1, "timeout_minutes": 30})
+        if self._rules and incident.severity.value in ("P1", "P2"):
+            for event_type, rule_actions in self._rules.items():
+                if incident.event_type_matches(event_type):
+                    actions.extend(rule_actions)
         return actions
 
     def _in_maintenance_window(self) -> bool:
         now = datetime.utcnow()
-        for w in self._maintenance_windows:
-            start = w.get("start")
-            end = w.get("end")
-            if start and end:
-                try:
-                    from dateutil import parser as dup
-                    s = dup.parse(start)
-                    e = dup.parse(end)
-                    if s <= now <= e:
-                        return True
-                except Exception:
-                    pass
-        return False
-
-
+        if any(s <= now <= e for s, e in self._parsed_windows):
+            return True
+        t = now.time()
+        # A daily window whose end is before its start spans midnight.
+        return any(s <= t <= e if s <= e else t >= s or t <= e for s, e in self._daily_windows)
@@ -1,6 +1,7 @@
 # OpenSecAgent - Curated system prompts for scan vs resolve
 from __future__ import annotations
 
+import functools
 from typing import Any
 
 PROMPT_SCAN = """You are a defensive security scanning agent. Your job is to analyze the system state and suggest commands to SCAN and DISCOVER potential vulnerabilities or misconfigurations. Do NOT suggest remediation yet—only information-gathering commands.
@@ -11,8 +12,9 @@ Return ONLY valid JSON in this exact format:
 If your analysis of command outputs reveals a potential vulnerability or issue, set "vulnerability_found": true and include a short "finding" in your response:
 {"commands": [], "done": true, "vulnerability_found": true, "finding": {"title": "...", "description": "...", "severity": "P2"}}
 
-Allowed commands (read-only): apt list, dpkg -l, rpm -qa, ss -tlnp, netstat, docker ps, docker images, docker inspect, cat /etc/*, ls -la /etc/, getent, systemctl list-units, systemctl status, id, whoami, uname -a, hostname.
+Allowed commands (read-only): apt list, dpkg -l, rpm -qa, ss -tlnp, netstat, docker ps, docker images, docker inspect, cat /etc/<file>, ls -la /etc/, getent, systemctl list-units, systemctl status, id, whoami, uname -a, hostname.
 Never suggest: rm, dd, mkfs, or any destructive or write command during SCAN.
+Commands are executed directly, not through a shell: do not use pipes, redirection, ';', '&&' or glob patterns.
 Use "done": true when scan is complete or no more scan commands are needed."""
 
 PROMPT_RESOLVE = """You are a defensive security remediation agent. Your job is to RESOLVE a known threat or vulnerability. You may suggest safe remediation commands based on the context and previous similar resolutions.
@@ -29,16 +31,26 @@ Return ONLY valid JSON:
 
 Allowed commands: ps aux, top -bn1, pgrep -f, docker ps, docker top <id>, docker exec <id> ps aux, docker exec <id> top -bn1, docker exec <id> kill -9 <pid>, docker exec <id> npm uninstall <pkg>, docker exec <id> rm -f <path>, docker exec <id> ls, kill -9 <pid> (host), docker stop, docker rm -f, apt install/upgrade -y, ufw deny, iptables -I INPUT. Also all read-only scan commands.
 Never suggest: rm -rf /, dd, overwriting critical system files, or commands not in the allowed list.
+Commands are executed directly, not through a shell: do not use pipes, redirection, ';', '&&' or glob patterns.
 Use "done": true when the threat is resolved or no further safe actions remain."""
 
 
-def get_system_prompt(mode: str, threat_context: str, config: dict[str, Any]) -> str:
-    """Get curated system prompt for mode (scan | resolve)."""
-    custom = (config.get("prompts") or {}).get(mode)
+# Stripped once at import so composing with threat context needs no rstrip of the built-ins.
+_BASE_PROMPTS = {"scan": PROMPT_SCAN.rstrip(), "resolve": PROMPT_RESOLVE.rstrip()}
+
+
+@functools.lru_cache(maxsize=64)
+def _compose(mode: str, threat_context: str, custom: str | None) -> str:
     if custom:
-        base = custom
+        base = custom.rstrip() if threat_context else custom
     else:
-        base = PROMPT_SCAN if mode == "scan" else PROMPT_RESOLVE
+        base = _BASE_PROMPTS["scan" if mode == "scan" else "resolve"]
     if threat_context:
-        base = base.rstrip() + "\n\n---\n\n" + threat_context
+        base = base + "\n\n---\n\n" + threat_context
     return base
+
+
+def get_system_prompt(mode: str, threat_context: str, config: dict[str, Any]) -> str:
+    """Get curated system prompt for mode (scan | resolve)."""
+    custom = (config.get("prompts") or {}).get(mode)
+    return _compose(mode, threat_context or "", str(custom) if custom else None)
@@ -1,12 +1,11 @@
 # OpenSecAgent - Full activity logger (every collector, detector, command, LLM call)
 from __future__ import annotations
 
-import asyncio
-import json
-from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+from opensecagent.reporter.jsonl import JsonlWriter, now_iso
+
 logger = __import__("logging").getLogger("opensecagent.activity")
 
 
@@ -19,32 +18,24 @@ class ActivityLogger:
         act = config.get("activity", {})
         log_dir = Path(config.get("agent", {}).get("log_dir", "/var/log/opensecagent"))
         self._path = Path(act.get("file", str(log_dir / "activity.jsonl")))
-        self._file: Any = None
-        self._lock: asyncio.Lock | None = None
+        self._writer = JsonlWriter(self._path)
         self._enabled = act.get("enabled", True)
 
     async def start(self) -> None:
         if not self._enabled:
             return
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._file = open(self._path, "a")
+        await self._writer.start()
 
     async def stop(self) -> None:
-        if self._file:
-            self._file.close()
-            self._file = None
+        await self._writer.stop()
 
-    async def _write(self, record: dict[str, Any]) -> None:
-        if not self._enabled or not self._file:
+    def _write(self, record: dict[str, Any]) -> None:
+        """Stamp and enqueue a record; returns immediately (the writer's drain task does the I/O)."""
+        if not self._enabled:
             return
-        if self._lock is None:
-            self._lock = asyncio.Lock()
-        async with self._lock:
-            line = json.dumps({"ts": datetime.utcnow().isoformat() + "Z", **record}) + "\n"
-            self._file.write(line)
-            self._file.flush()
+        self._writer.put({"ts": now_iso(), **record}, urgent=record.get("type") == "policy_decision")
 
-    async def log_collector_run(
+    def log_collector_run(
         self,
         collector: str,
         started_at: str,
@@ -52,7 +43,7 @@ class ActivityLogger:
         summary: str,
         error: str | None = None,
     ) -> None:
-        await self._write({
+        self._write({
             "type": "collector_run",
             "collector": collector,
             "started_at": started_at,
@@ -61,14 +52,14 @@ class ActivityLogger:
             "error": error,
         })
 
-    async def log_detector_run(
+    def log_detector_run(
         self,
         detector: str,
         events_found: int,
         event_types: list[str],
         duration_sec: float,
     ) -> None:
-        await self._write({
+        self._write({
             "type": "detector_run",
             "detector": detector,
             "events_found": events_found,
@@ -76,14 +67,14 @@ class ActivityLogger:
             "duration_sec": round(duration_sec, 3),
         })
 
-    async def log_policy_decision(
+    def log_policy_decision(
         self,
         incident_id: str,
         severity: str,
         allowed_actions: list[str],
         reason: str,
     ) -> None:
-        await self._write({
+        self._write({
             "type": "policy_decision",
             "incident_id": incident_id,
             "severity": severity,
@@ -91,7 +82,7 @@ class ActivityLogger:
             "reason": reason,
         })
 
-    async def log_command_execution(
+    def log_command_execution(
         self,
         command: str,
         exit_code: int,
@@ -100,7 +91,7 @@ class ActivityLogger:
         duration_sec: float,
         source: str = "responder",
     ) -> None:
-        await self._write({
+        self._write({
             "type": "command_execution",
             "command": command,
             "exit_code": exit_code,
@@ -110,7 +101,7 @@ class ActivityLogger:
             "source": source,
         })
 
-    async def log_llm_call(
+    def log_llm_call(
         self,
         purpose: str,
         prompt_tokens: int | None,
@@ -119,7 +110,7 @@ class ActivityLogger:
         success: bool,
         error: str | None = None,
     ) -> None:
-        await self._write({
+        self._write({
             "type": "llm_call",
             "purpose": purpose,
             "prompt_tokens": prompt_tokens,
@@ -129,7 +120,7 @@ class ActivityLogger:
             "error": error,
         })
 
-    async def log_agent_iteration(
+    def log_agent_iteration(
         self,
         iteration: int,
         commands_suggested: int,
@@ -137,7 +128,7 @@ class ActivityLogger:
         done: bool,
         summary: str,
     ) -> None:
-        await self._write({
+        self._write({
             "type": "agent_iteration",
             "iteration": iteration,
             "commands_suggested": commands_suggested,
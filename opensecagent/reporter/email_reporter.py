@@ -1,8 +1,10 @@
 # OpenSecAgent - Email reporter: SMTP or Resend.com
 from __future__ import annotations
 
+import asyncio
 import base64
 import logging
+import traceback
 from pathlib import Path
 from typing import Any
 
@@ -11,6 +13,14 @@ from opensecagent.models import Incident
 logger = logging.getLogger("opensecagent.email_reporter")
 
 
+def _read_attachment(path: str | Path) -> bytes | None:
+    """Attachment bytes, or None if the file is missing (exists + read in one worker-thread trip)."""
+    p = Path(path)
+    if not p.exists():
+        return None
+    return p.read_bytes()
+
+
 class EmailReporter:
     """Send notifications via SMTP or Resend.com (provider chosen in config)."""
 
@@ -25,13 +35,30 @@ class EmailReporter:
         self._from = self._smtp.get("from", "OpenSecAgent <noreply@localhost>")
         if self._provider == "resend":
             self._from = self._resend.get("from", self._from)
+        # Config is fixed for the reporter's lifetime, so resolve sendability and recipients once.
+        if not self._admin_emails:
+            self._can_send_cached = False
+        elif self._provider == "resend":
+            self._can_send_cached = bool(self._resend.get("api_key")) and bool(self._resend.get("from"))
+        else:
+            self._can_send_cached = bool(self._smtp.get("host"))
+        self._to_header = ", ".join(self._admin_emails)
+        self._to_list = list(self._admin_emails)
+        # One httpx client per reporter so Resend calls reuse pooled connections.
+        self._http: Any = None
+
+    async def start(self) -> None:
+        if self._provider == "resend" and self._http is None:
+            import httpx
+            self._http = httpx.AsyncClient(timeout=30.0)
+
+    async def aclose(self) -> None:
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     def _can_send(self) -> bool:
-        if not self._admin_emails:
-            return False
-        if self._provider == "resend":
-            return bool(self._resend.get("api_key")) and bool(self._resend.get("from"))
-        return bool(self._smtp.get("host"))
+        return self._can_send_cached
 
     async def send_incident_alert(self, incident: Incident, actions_taken: list[dict[str, Any]]) -> None:
         if not self._can_send():
@@ -71,26 +98,29 @@ class EmailReporter:
         if not self._can_send():
             return
         subject = f"[OpenSecAgent] Resolved: {title[:50]}"
-        body = (
-            f"OpenSecAgent has resolved the following vulnerability.\n\n"
-            f"Threat ID: {threat_id}\n"
-            f"Title: {title}\n\n"
-            f"Description: {description[:500]}\n\n"
-            "Actions taken to resolve:\n"
-        )
-        for a in actions_taken:
-            body += f"  - {a}\n"
-        body += "\nPlease verify the system state if needed.\n"
+        parts = [
+            "OpenSecAgent has resolved the following vulnerability.",
+            "",
+            f"Threat ID: {threat_id}",
+            f"Title: {title}",
+            "",
+            f"Description: {description[:500]}",
+            "",
+            "Actions taken to resolve:",
+        ]
+        parts.extend(f"  - {a}" for a in actions_taken)
+        parts += ["", "Please verify the system state if needed.", ""]
+        body = "\n".join(parts)
         await self._send_mail(subject, body)
 
     async def send_daily_digest(self, incidents: list[dict[str, Any]]) -> None:
         if not self._can_send():
             return
         subject = "[OpenSecAgent] Daily security digest"
-        body = "OpenSecAgent Daily Digest\n\n"
-        body += f"Incidents in last 24h: {len(incidents)}\n\n"
-        for inc in incidents[:20]:
-            body += f"- [{inc.get('severity', '')}] {inc.get('title', '')}\n"
+        parts = ["OpenSecAgent Daily Digest", "", f"Incidents in last 24h: {len(incidents)}", ""]
+        parts.extend(f"- [{inc.get('severity', '')}] {inc.get('title', '')}" for inc in incidents[:20])
+        parts.append("")
+        body = "\n".join(parts)
         await self._send_mail(subject, body)
 
     async def send_run_report(self, subject: str, body: str) -> None:
@@ -103,12 +133,15 @@ class EmailReporter:
         """Send an error notification to admin emails (e.g. unhandled exception in daemon or CLI)."""
         if not self._can_send():
             return
-        import traceback
         subject = f"[OpenSecAgent] Error: {str(error)[:80]}"
-        body = f"{context} encountered an error.\n\n"
-        body += f"Exception: {type(error).__name__}: {error}\n\n"
-        body += "Traceback:\n"
-        body += traceback.format_exc()
+        # Format from the exception itself (not sys.exc_info()), off the loop: deep stacks are slow to render.
+        tb = await asyncio.to_thread(traceback.format_exception, type(error), error, error.__traceback__)
+        body = "".join([
+            f"{context} encountered an error.\n\n",
+            f"Exception: {type(error).__name__}: {error}\n\n",
+            "Traceback:\n",
+            *tb,
+        ])
         await self._send_mail(subject, body)
 
     def _format_incident_body(self, incident: Incident, actions_taken: list[dict[str, Any]]) -> str:
@@ -163,13 +196,13 @@ class EmailReporter:
             import aiosmtplib
             msg = EmailMessage()
             msg["From"] = self._from
-            msg["To"] = ", ".join(self._admin_emails)
+            msg["To"] = self._to_header
             msg["Subject"] = subject
             msg.set_content(body)
-            if attachment_path and Path(attachment_path).exists():
-                path = Path(attachment_path)
+            raw = await asyncio.to_thread(_read_attachment, attachment_path) if attachment_path else None
+            if raw is not None:
                 msg.add_attachment(
-                    path.read_bytes(),
+                    raw,
                     maintype="application",
                     subtype="pdf",
                     filename=attachment_name,
@@ -197,21 +230,23 @@ class EmailReporter:
             api_key = self._resend.get("api_key", "")
             payload: dict[str, Any] = {
                 "from": self._from,
-                "to": list(self._admin_emails),
+                "to": self._to_list,
                 "subject": subject,
                 "text": body,
             }
-            if attachment_path and Path(attachment_path).exists():
-                raw = Path(attachment_path).read_bytes()
-                payload["attachments"] = [
-                    {"content": base64.b64encode(raw).decode("ascii"), "filename": attachment_name}
-                ]
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                r = await client.post(
-                    "https://api.resend.com/emails",
-                    headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                    json=payload,
-                )
+            raw = await asyncio.to_thread(_read_attachment, attachment_path) if attachment_path else None
+            if raw is not None:
+                # Encode off the event loop too; a multi-MB PDF would otherwise stall other tasks.
+                b64 = await asyncio.to_thread(base64.b64encode, raw)
+                del raw
+                payload["attachments"] = [{"content": b64.decode("ascii"), "filename": attachment_name}]
+            if self._http is None:
+                self._http = httpx.AsyncClient(timeout=30.0)
+            r = await self._http.post(
+                "https://api.resend.com/emails",
+                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+                json=payload,
+            )
             if r.status_code >= 400:
                 logger.warning("Resend API error %s: %s", r.status_code, r.text[:200])
         except Exception as e:
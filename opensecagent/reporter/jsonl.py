@@ -0,0 +1,180 @@
+# OpenSecAgent - Append-only JSONL writer shared by the audit and activity loggers
+from __future__ import annotations
+
+import asyncio
+import fcntl
+import json
+import os
+import select
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = __import__("logging").getLogger("opensecagent.jsonl")
+
+# Max records written per batch by the drain task.
+_BATCH_MAX = 50
+# Buffered lines are flushed at most this long after being written (urgent records flush at once).
+_FLUSH_INTERVAL_SEC = 0.25
+# write(2) on an O_APPEND file is atomic up to PIPE_BUF bytes; larger lines are written under flock.
+_ATOMIC_WRITE_MAX = select.PIPE_BUF
+
+# (time.time() of the last stamp, its ISO string); records logged within the same millisecond share it.
+_ts_cache: tuple[float, str] = (0.0, "")
+
+
+def now_iso() -> str:
+    """UTC timestamp as ISO-8601 with a trailing Z, memoized at 1 ms resolution."""
+    global _ts_cache
+    now = time.time()
+    last, iso = _ts_cache
+    if 0 <= now - last < 0.001:
+        return iso
+    iso = datetime.utcfromtimestamp(now).isoformat() + "Z"
+    _ts_cache = (now, iso)
+    return iso
+
+
+def _dumps_line(record: dict[str, Any]) -> bytes:
+    """One JSONL line as UTF-8 bytes; orjson (C encoder, handles datetime) when installed."""
+    if orjson is not None:
+        return orjson.dumps(
+            record,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+        )
+    return (json.dumps(record) + "\n").encode("utf-8")
+
+
+class JsonlWriter:
+    """Records are serialized and queued by the caller; one background task drains the queue
+    into an in-memory buffer that is appended to the file every 250 ms (or at once for urgent
+    records). The file is opened O_APPEND and written in line-aligned chunks of at most
+    PIPE_BUF bytes, so lines from concurrent processes (daemon + CLI) never interleave."""
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._fd: int | None = None
+        self._queue: asyncio.Queue[tuple[bytes, bool]] | None = None
+        self._drain_task: asyncio.Task[Any] | None = None
+        self._pending: list[bytes] = []
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._last_flush = 0.0
+        # Threaded write of an oversized line; shielded, so stop() can wait for it before closing.
+        self._locked_write: asyncio.Future[None] | None = None
+
+    async def start(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(str(self._path), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+        self._queue = asyncio.Queue()
+        self._drain_task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        if self._drain_task:
+            self._drain_task.cancel()
+            try:
+                await self._drain_task
+            except asyncio.CancelledError:
+                pass
+            self._drain_task = None
+        if self._locked_write is not None:
+            try:
+                await self._locked_write
+            except Exception as e:
+                logger.warning("Failed to write %s: %s", self._path, e)
+            self._locked_write = None
+        if self._queue is not None:
+            while not self._queue.empty():
+                self._pending.append(self._queue.get_nowait()[0])
+            self._queue = None
+        self._flush()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def put(self, record: dict[str, Any], urgent: bool = False) -> None:
+        """Queue a record; urgent records (incidents, policy decisions) are flushed as soon as written."""
+        if self._queue is None:
+            return
+        self._queue.put_nowait((_dumps_line(record), urgent))
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _BATCH_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+            lines = [line for line, _ in batch]
+            i = 0
+            try:
+                while i < len(lines):
+                    line = lines[i]
+                    i += 1
+                    if len(line) <= _ATOMIC_WRITE_MAX:
+                        self._pending.append(line)
+                        continue
+                    # Too large for an atomic append: keep order, then write under an exclusive lock.
+                    self._flush()
+                    self._locked_write = asyncio.ensure_future(asyncio.to_thread(self._write_locked, line))
+                    try:
+                        await asyncio.shield(self._locked_write)
+                    except asyncio.CancelledError:
+                        raise
+                    except Exception as e:
+                        logger.warning("Failed to write %s: %s", self._path, e)
+                    self._locked_write = None
+            except asyncio.CancelledError:
+                # stop() writes the rest of the batch after the in-flight line completes.
+                self._pending.extend(lines[i:])
+                raise
+            elapsed = time.monotonic() - self._last_flush
+            if any(urgent for _, urgent in batch) or elapsed >= _FLUSH_INTERVAL_SEC:
+                self._flush()
+            elif self._pending and self._flush_timer is None:
+                self._flush_timer = asyncio.get_running_loop().call_later(_FLUSH_INTERVAL_SEC - elapsed, self._flush)
+
+    def _flush(self) -> None:
+        """Append buffered lines, packing whole lines into writes of at most PIPE_BUF bytes.
+        Oversized lines only reach the buffer on shutdown and are written under the lock in place."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        self._last_flush = time.monotonic()
+        if self._fd is None or not self._pending:
+            return
+        lines, self._pending = self._pending, []
+        try:
+            chunk: list[bytes] = []
+            size = 0
+            for line in lines:
+                if chunk and size + len(line) > _ATOMIC_WRITE_MAX:
+                    os.write(self._fd, b"".join(chunk))
+                    chunk, size = [], 0
+                if len(line) > _ATOMIC_WRITE_MAX:
+                    self._write_locked(line)
+                    continue
+                chunk.append(line)
+                size += len(line)
+            if chunk:
+                os.write(self._fd, b"".join(chunk))
+        except Exception as e:
+            logger.warning("Failed to write %s: %s", self._path, e)
+
+    def _write_locked(self, line: bytes) -> None:
+        """Append one oversized line while holding an exclusive flock (run in a worker thread)."""
+        fd = self._fd
+        if fd is None:
+            return
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            view = memoryview(line)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+from collections import deque
+from datetime import datetime, timedelta
 from typing import Any
 
 from opensecagent.models import Incident
@@ -10,18 +12,22 @@ from opensecagent.models import Incident
 logger = logging.getLogger("opensecagent.reporter")
 
 
-def _incident_to_dict(incident: Incident) -> dict[str, Any]:
-    return {
-        "incident_id": incident.incident_id,
-        "severity": incident.severity.value,
-        "title": incident.title,
-        "narrative": incident.narrative,
-        "created_at": incident.created_at.isoformat() + "Z",
-        "events": [{"event_type": e.event_type, "summary": e.summary} for e in incident.events],
-        "recommended_actions": incident.recommended_actions,
-        "actions_taken": incident.actions_taken,
-        "llm_summary": incident.llm_summary,
-    }
+# Incident fields kept for the daily digest (the audit log also records evidence_summary).
+# Pending digest entries are capped so a digest that never goes out cannot grow without bound.
+_DIGEST_MAX = 500
+_DIGEST_FIELDS = frozenset({
+    "incident_id", "severity", "title", "narrative", "created_at",
+    "events", "recommended_actions", "actions_taken", "llm_summary",
+})
+
+
+def _seconds_until(hour: int, minute: int) -> float:
+    """Seconds from now until the next hour:minute UTC."""
+    now = datetime.utcnow()
+    target = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if target <= now:
+        target += timedelta(days=1)
+    return (target - now).total_seconds()
 
 
 class ReporterManager:
@@ -30,12 +36,18 @@ class ReporterManager:
         self._audit = audit
         self._email_reporter: Any = None
         self._digest_task: asyncio.Task[Any] | None = None
-        self._pending_digest: list[dict[str, Any]] = []
+        self._pending_digest: deque[dict[str, Any]] = deque(maxlen=_DIGEST_MAX)
+        self._digest_enabled = False
+        self._immediate: frozenset[str] = frozenset()
 
     async def start(self) -> None:
         from opensecagent.reporter.email_reporter import EmailReporter
-        self._email_reporter = EmailReporter(self.config.get("notifications", {}))
-        if self.config.get("notifications", {}).get("digest", {}).get("enabled"):
+        notif = self.config.get("notifications", {})
+        self._email_reporter = EmailReporter(notif)
+        await self._email_reporter.start()
+        self._immediate = frozenset(notif.get("immediate_severities", ("P1", "P2")))
+        self._digest_enabled = bool(notif.get("digest", {}).get("enabled"))
+        if self._digest_enabled:
             self._digest_task = asyncio.create_task(self._run_digest_loop())
 
     async def cleanup(self) -> None:
@@ -45,10 +57,13 @@ class ReporterManager:
                 await self._digest_task
             except asyncio.CancelledError:
                 pass
+        if self._email_reporter:
+            await self._email_reporter.aclose()
 
     async def report_incident(self, incident: Incident, actions_taken: list[dict[str, Any]]) -> None:
-        self._pending_digest.append(_incident_to_dict(incident))
-        immediate = incident.severity.value in self.config.get("notifications", {}).get("immediate_severities", ["P1", "P2"])
+        if self._digest_enabled:
+            self._pending_digest.append({k: v for k, v in incident.to_dict().items() if k in _DIGEST_FIELDS})
+        immediate = incident.severity.value in self._immediate
         if immediate and self._email_reporter:
             await self._email_reporter.send_incident_alert(incident, actions_taken)
 
@@ -76,17 +91,13 @@ class ReporterManager:
             )
 
     async def _run_digest_loop(self) -> None:
-        from datetime import datetime, time as dtime
         cfg = self.config.get("notifications", {}).get("digest", {})
         hour = cfg.get("hour_utc", 8)
         minute = cfg.get("minute", 0)
         while True:
-            await asyncio.sleep(60)
-            now = datetime.utcnow()
-            if now.hour == hour and now.minute >= minute:
-                if self._pending_digest:
-                    copy = self._pending_digest[:]
-                    self._pending_digest.clear()
-                    if self._email_reporter:
-                        await self._email_reporter.send_daily_digest(copy)
-                await asyncio.sleep(3600)
+            await asyncio.sleep(_seconds_until(hour, minute))
+            if self._pending_digest:
+                copy = list(self._pending_digest)
+                self._pending_digest.clear()
+                if self._email_reporter:
+                    await self._email_reporter.send_daily_digest(copy)
@@ -1,9 +1,47 @@
 # OpenSecAgent - PDF report generation for vulnerability notifications
 from __future__ import annotations
 
+import hashlib
+import json
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
+from xml.sax.saxutils import escape as _esc
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_RL: dict[str, Any] | None = None
+_RL_LOCK = threading.Lock()
+
+
+def _get_rl() -> dict[str, Any] | None:
+    """reportlab classes plus a shared sample stylesheet, imported and built once; None if not installed."""
+    global _RL
+    if _RL is None:
+        with _RL_LOCK:
+            if _RL is None:
+                try:
+                    from reportlab.lib.pagesizes import A4
+                    from reportlab.lib.styles import getSampleStyleSheet
+                    from reportlab.lib.units import inch
+                    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer
+                except ImportError:
+                    _RL = {}
+                else:
+                    _RL = {
+                        "A4": A4,
+                        "inch": inch,
+                        "styles": getSampleStyleSheet(),
+                        "SimpleDocTemplate": SimpleDocTemplate,
+                        "PageBreak": PageBreak,
+                        "Paragraph": Paragraph,
+                        "Spacer": Spacer,
+                    }
+    return _RL or None
 
 
 def generate_vulnerability_pdf(
@@ -11,64 +49,143 @@ def generate_vulnerability_pdf(
     threat_id: str,
     output_path: str | Path,
     host_context: dict[str, Any] | None = None,
+    max_evidence_rows: int = 20,
 ) -> Path:
-    """Generate a PDF report for a vulnerability finding. Returns path to PDF."""
+    """Generate a PDF report for a vulnerability finding. Returns path to PDF.
+    A sibling <name>.pdf.sha holds a hash of the inputs; if it matches, the existing file is reused."""
+    rl = _get_rl()
+    path = Path(output_path)
+    key = _content_key(finding, host_context, threat_id, max_evidence_rows, rl is not None)
+    sha_path = path.with_suffix(".pdf.sha")
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-        from reportlab.lib import colors
-    except ImportError:
+        if path.exists() and sha_path.read_text() == key:
+            return path
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if rl is None:
         # Fallback: write a text file with .pdf extension (viewable as text)
-        path = Path(output_path)
-        path.parent.mkdir(parents=True, exist_ok=True)
         with open(path, "w") as f:
-            f.write(f"OpenSecAgent Vulnerability Report\n")
-            f.write(f"Threat ID: {threat_id}\n")
-            f.write(f"Generated: {datetime.utcnow().isoformat()}Z\n\n")
-            f.write(f"Title: {finding.get('title', '')}\n")
-            f.write(f"Severity: {finding.get('severity', '')}\n\n")
-            f.write(f"Description:\n{finding.get('description', '')}\n")
-        return path
+            f.write(_finding_text(finding, threat_id))
+    else:
+        _new_doc(rl, path).build(_finding_story(rl, finding, threat_id, host_context, max_evidence_rows))
+    sha_path.write_text(key)
+    return path
 
+
+def generate_vulnerability_pdf_batch(
+    findings: list[tuple[dict[str, Any], str]],
+    output_path: str | Path,
+    host_context: dict[str, Any] | None = None,
+    max_evidence_rows: int = 20,
+) -> tuple[Path, list[dict[str, Any]]]:
+    """Render several (finding, threat_id) pairs into one PDF with a single build, one finding per
+    page run. Returns the path and a manifest of {"threat_id", "first_page", "last_page"} entries
+    (empty when reportlab is unavailable and a text report is written instead)."""
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    doc = SimpleDocTemplate(str(path), pagesize=A4, rightMargin=inch, leftMargin=inch, topMargin=inch, bottomMargin=inch)
-    styles = getSampleStyleSheet()
+    rl = _get_rl()
+    if rl is None:
+        with open(path, "w") as f:
+            f.write("\n\n".join(_finding_text(finding, threat_id) for finding, threat_id in findings))
+        return path, []
+
+    doc = _new_doc(rl, path)
+    starts: list[tuple[str, int]] = []
+
+    def after_flowable(flowable: Any) -> None:
+        threat_id = getattr(flowable, "_osa_threat_id", None)
+        if threat_id is not None:
+            starts.append((threat_id, doc.page))
+
+    doc.afterFlowable = after_flowable
+    story: list[Any] = []
+    for i, (finding, threat_id) in enumerate(findings):
+        if i:
+            story.append(rl["PageBreak"]())
+        part = _finding_story(rl, finding, threat_id, host_context, max_evidence_rows)
+        part[0]._osa_threat_id = threat_id
+        story.extend(part)
+    doc.build(story)
+    manifest = [
+        {
+            "threat_id": threat_id,
+            "first_page": first,
+            "last_page": starts[i + 1][1] - 1 if i + 1 < len(starts) else doc.page,
+        }
+        for i, (threat_id, first) in enumerate(starts)
+    ]
+    return path, manifest
+
+
+def _content_key(*parts: Any) -> str:
+    """sha256 over a canonical (key-sorted) JSON encoding of the report inputs."""
+    if orjson is not None:
+        data = orjson.dumps(parts, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    else:
+        data = json.dumps(parts, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _finding_text(finding: dict[str, Any], threat_id: str) -> str:
+    return (
+        "OpenSecAgent Vulnerability Report\n"
+        f"Threat ID: {threat_id}\n"
+        f"Generated: {datetime.utcnow().isoformat()}Z\n\n"
+        f"Title: {finding.get('title', '')}\n"
+        f"Severity: {finding.get('severity', '')}\n\n"
+        f"Description:\n{finding.get('description', '')}\n"
+    )
+
+
+def _new_doc(rl: dict[str, Any], path: Path) -> Any:
+    inch = rl["inch"]
+    return rl["SimpleDocTemplate"](
+        str(path), pagesize=rl["A4"], rightMargin=inch, leftMargin=inch, topMargin=inch, bottomMargin=inch
+    )
+
+
+def _finding_story(
+    rl: dict[str, Any],
+    finding: dict[str, Any],
+    threat_id: str,
+    host_context: dict[str, Any] | None,
+    max_evidence_rows: int = 20,
+) -> list[Any]:
+    """Flowables for one finding: header, title/severity, description, evidence, host context."""
+    Paragraph, Spacer, inch, styles = rl["Paragraph"], rl["Spacer"], rl["inch"], rl["styles"]
     story = []
 
     story.append(Paragraph("OpenSecAgent — Vulnerability Report", styles["Title"]))
     story.append(Spacer(1, 0.2 * inch))
-    story.append(Paragraph(f"Threat ID: {threat_id}", styles["Normal"]))
+    story.append(Paragraph(f"Threat ID: {_esc(str(threat_id))}", styles["Normal"]))
     story.append(Paragraph(f"Generated: {datetime.utcnow().isoformat()}Z", styles["Normal"]))
     story.append(Spacer(1, 0.3 * inch))
 
-    story.append(Paragraph(f"<b>Title:</b> {finding.get('title', 'N/A')}", styles["Normal"]))
-    story.append(Paragraph(f"<b>Severity:</b> {finding.get('severity', 'N/A')}", styles["Normal"]))
+    story.append(Paragraph(f"<b>Title:</b> {_esc(str(finding.get('title', 'N/A')))}", styles["Normal"]))
+    story.append(Paragraph(f"<b>Severity:</b> {_esc(str(finding.get('severity', 'N/A')))}", styles["Normal"]))
     story.append(Spacer(1, 0.2 * inch))
     story.append(Paragraph("<b>Description</b>", styles["Heading2"]))
-    story.append(Paragraph((finding.get("description") or "N/A").replace("\n", "<br/>"), styles["Normal"]))
+    story.append(Paragraph(_esc(str(finding.get("description") or "N/A")).replace("\n", "<br/>"), styles["Normal"]))
     story.append(Spacer(1, 0.2 * inch))
 
     if finding.get("evidence"):
         story.append(Paragraph("<b>Evidence</b>", styles["Heading2"]))
         evidence = finding.get("evidence", {})
-        if isinstance(evidence, dict):
-            data = [["Key", "Value"]]
-            for k, v in list(evidence.items())[:20]:
-                data.append([str(k), str(v)[:200]])
-            t = Table(data)
-            t.setStyle(TableStyle([("BACKGROUND", (0, 0), (-1, 0), colors.grey), ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke)]))
-            story.append(t)
+        if not isinstance(evidence, dict):
+            story.append(Paragraph(_esc(str(evidence)[:1000]), styles["Normal"]))
         else:
-            story.append(Paragraph(str(evidence)[:1000], styles["Normal"]))
+            # One flowable for all entries: a line-broken Paragraph lays out far cheaper than a Table.
+            rows = list(evidence.items())[:max_evidence_rows]
+            story.append(Paragraph(
+                "<br/>".join(f"<b>{_esc(str(k))}:</b> {_esc(str(v)[:200])}" for k, v in rows),
+                styles["Normal"],
+            ))
         story.append(Spacer(1, 0.2 * inch))
 
     if host_context:
         story.append(Paragraph("<b>Host context</b>", styles["Heading2"]))
-        story.append(Paragraph(f"Hostname: {host_context.get('hostname', 'N/A')}", styles["Normal"]))
-        story.append(Paragraph(f"OS: {host_context.get('os', '')} {host_context.get('os_release', '')}", styles["Normal"]))
+        story.append(Paragraph(f"Hostname: {_esc(str(host_context.get('hostname', 'N/A')))}", styles["Normal"]))
+        story.append(Paragraph(_esc(f"OS: {host_context.get('os', '')} {host_context.get('os_release', '')}"), styles["Normal"]))
 
-    doc.build(story)
-    return path
+    return story
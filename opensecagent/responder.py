@@ -4,27 +4,39 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from opensecagent.models import Incident
 
 logger = logging.getLogger("opensecagent.responder")
 
 
+def _stop_container(client: Any, cid: str) -> float:
+    """Blocking docker stop (run in a worker thread); returns how long it took."""
+    t0 = time.monotonic()
+    client.containers.get(cid).stop(timeout=10)
+    return time.monotonic() - t0
+
+
 class Responder:
     def __init__(self, config: dict[str, Any], audit: Any, activity: Any = None) -> None:
         self.config = config
         self._audit = audit
         self._activity = activity
+        self._docker_client: Any = None
+        # action -> (event type the incident must contain, executor)
+        self._handlers: dict[str, tuple[str, Callable[[Incident, dict[str, Any]], Awaitable[None]]]] = {
+            "stop_container": ("new_container", self._stop_containers),
+            "block_ip_temporary": ("auth_failures", self._block_ip_temporary),
+        }
 
     async def execute(self, action_spec: dict[str, Any], incident: Incident) -> None:
         action = action_spec.get("action")
         if action == "alert_only":
             return
-        if action == "stop_container" and incident.event_type_matches("new_container"):
-            await self._stop_containers(incident, action_spec)
-        elif action == "block_ip_temporary" and incident.event_type_matches("auth_failures"):
-            await self._block_ip_temporary(incident, action_spec)
+        handler = self._handlers.get(action)
+        if handler is not None and incident.event_type_matches(handler[0]):
+            await handler[1](incident, action_spec)
         else:
             logger.info("No executor for action %s", action)
 
@@ -35,30 +47,36 @@ class Responder:
             return
         try:
             import docker
-            client = docker.from_env()
-            for cid in new_ids[:5]:
-                try:
-                    t0 = time.perf_counter()
-                    cont = client.containers.get(cid)
-                    cont.stop(timeout=10)
-                    duration = time.perf_counter() - t0
-                    cmd = f"docker stop {cid}"
-                    if self._activity:
-                        await self._activity.log_command_execution(
-                            cmd, 0, "stopped", "", duration, source="responder"
-                        )
-                    await self._audit.log_action("stop_container", {"container_id": cid}, incident.incident_id)
-                    incident.actions_taken.append(f"Stopped container {cid}")
-                except Exception as e:
-                    logger.warning("Could not stop container %s: %s", cid, e)
+            if self._docker_client is None:
+                self._docker_client = await asyncio.to_thread(docker.from_env)
+            client = self._docker_client
+            targets = new_ids[:5]
+            # Stops are independent and each may wait out its 10 s timeout, so run them concurrently.
+            results = await asyncio.gather(
+                *(asyncio.to_thread(_stop_container, client, cid) for cid in targets),
+                return_exceptions=True,
+            )
+            if any(isinstance(r, Exception) and not isinstance(r, docker.errors.NotFound) for r in results):
+                # Possibly a dropped daemon connection; reconnect on the next response.
+                self._docker_client = None
+            for cid, result in zip(targets, results):
+                if isinstance(result, BaseException):
+                    logger.warning("Could not stop container %s: %s", cid, result)
                     if self._activity:
-                        await self._activity.log_command_execution(
-                            f"docker stop {cid}", -1, "", str(e), 0, source="responder"
+                        self._activity.log_command_execution(
+                            f"docker stop {cid}", -1, "", str(result), 0, source="responder"
                         )
+                    continue
+                if self._activity:
+                    self._activity.log_command_execution(
+                        f"docker stop {cid}", 0, "stopped", "", result, source="responder"
+                    )
+                self._audit.log_action("stop_container", {"container_id": cid}, incident.incident_id)
+                incident.actions_taken.append(f"Stopped container {cid}")
         except Exception as e:
             logger.warning("Docker stop failed: %s", e)
 
     async def _block_ip_temporary(self, incident: Incident, spec: dict[str, Any]) -> None:
         timeout_min = spec.get("timeout_minutes", 30)
         logger.info("block_ip_temporary would block IP (Tier 1); timeout=%s min. Not implemented in MVP.", timeout_min)
-        await self._audit.log_action("block_ip_temporary_skipped", {"timeout_minutes": timeout_min}, incident.incident_id)
+        self._audit.log_action("block_ip_temporary_skipped", {"timeout_minutes": timeout_min}, incident.incident_id)
@@ -1,14 +1,106 @@
 # OpenSecAgent - Threat registry: store and load past threats for LLM context
 from __future__ import annotations
 
+import asyncio
+import heapq
+import itertools
 import json
+import os
 import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = __import__("logging").getLogger("opensecagent.threat_registry")
 
+# Writes that arrive within this window share one fsync pass.
+_FSYNC_BATCH_SEC = 0.2
+
+# (threats dir, limit) -> ((newest mtime_ns, file count), formatted context) from the last load.
+_CONTEXT_CACHE: dict[tuple[str, int], tuple[tuple[int, int], str]] = {}
+# threat file path -> (mtime_ns, formatted lines); unchanged records are neither re-read nor re-formatted.
+_LINE_CACHE: dict[str, tuple[int, list[str]]] = {}
+
+
+def _dump_json(path: Path, record: dict[str, Any]) -> None:
+    """Write record as indented JSON with one write call (json.dump issues a write per token).
+    The bytes go to a sibling .tmp file that is then renamed over path, so readers never see a partial record."""
+    if orjson is not None:
+        data = orjson.dumps(record, option=orjson.OPT_INDENT_2 | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(record, indent=2).encode("utf-8")
+    tmp = path.with_suffix(".json.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _fsync_paths(paths: set[Path]) -> None:
+    """fsync each file, then each containing directory once (so new entries are durable too)."""
+    for p in {*paths, *(p.parent for p in paths)}:
+        try:
+            fd = os.open(p, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.fsync(fd)
+        except OSError as e:
+            logger.debug("fsync %s failed: %s", p, e)
+        finally:
+            os.close(fd)
+
+
+class ThreatWriter:
+    """Batches durability for threat records. Files are still written synchronously (readers such as
+    mark_resolved see them at once); their paths are queued, and a background task fsyncs everything
+    written within a 200 ms window in one worker-thread pass instead of one fsync per record."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[Path] | None = None
+        self._task: asyncio.Task[Any] | None = None
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._queue is not None:
+            pending: set[Path] = set()
+            while not self._queue.empty():
+                pending.add(self._queue.get_nowait())
+            self._queue = None
+            if pending:
+                _fsync_paths(pending)
+
+    def put(self, path: Path) -> None:
+        """Queue a path for the next batched fsync; without a running writer, fsync it now."""
+        if self._queue is None:
+            _fsync_paths({path})
+            return
+        self._queue.put_nowait(path)
+
+    async def _drain(self) -> None:
+        queue = self._queue
+        assert queue is not None
+        while True:
+            batch = {await queue.get()}
+            await asyncio.sleep(_FSYNC_BATCH_SEC)
+            while not queue.empty():
+                batch.add(queue.get_nowait())
+            await asyncio.to_thread(_fsync_paths, batch)
+
 
 def get_threats_dir(config: dict[str, Any]) -> Path:
     data_dir = Path(config.get("agent", {}).get("data_dir", "/var/lib/opensecagent"))
@@ -29,8 +121,9 @@ def store_threat(
     evidence: dict[str, Any],
     resolution_actions: list[str] | None = None,
     threat_id: str | None = None,
+    writer: ThreatWriter | None = None,
 ) -> str:
-    """Store a threat record; returns threat_id."""
+    """Store a threat record; returns threat_id. With a writer, the file is also fsynced in its next batch."""
     d = ensure_threats_dir(config)
     threat_id = threat_id or f"thr-{uuid.uuid4().hex[:12]}"
     record = {
@@ -44,12 +137,18 @@ def store_threat(
         "resolved_at": datetime.utcnow().isoformat() + "Z" if resolution_actions else None,
     }
     path = d / f"{threat_id}.json"
-    with open(path, "w") as f:
-        json.dump(record, f, indent=2)
+    _dump_json(path, record)
+    if writer is not None:
+        writer.put(path)
     return threat_id
 
 
-def mark_resolved(config: dict[str, Any], threat_id: str, actions_taken: list[str]) -> None:
+def mark_resolved(
+    config: dict[str, Any],
+    threat_id: str,
+    actions_taken: list[str],
+    writer: ThreatWriter | None = None,
+) -> None:
     """Update a threat record with resolution actions."""
     d = get_threats_dir(config)
     path = d / f"{threat_id}.json"
@@ -59,8 +158,9 @@ def mark_resolved(config: dict[str, Any], threat_id: str, actions_taken: list[st
         record = json.load(f)
     record["resolution_actions"] = actions_taken
     record["resolved_at"] = datetime.utcnow().isoformat() + "Z"
-    with open(path, "w") as f:
-        json.dump(record, f, indent=2)
+    _dump_json(path, record)
+    if writer is not None:
+        writer.put(path)
 
 
 def load_threats_for_context(config: dict[str, Any], limit: int = 20) -> str:
@@ -68,25 +168,58 @@ def load_threats_for_context(config: dict[str, Any], limit: int = 20) -> str:
     d = get_threats_dir(config)
     if not d.exists():
         return ""
-    records: list[dict[str, Any]] = []
-    for p in sorted(d.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True):
+    files: list[tuple[int, str]] = []
+    with os.scandir(d) as it:
+        for entry in it:
+            # In-flight writes are "<id>.json.tmp" and never match.
+            if entry.name.endswith(".json") and entry.is_file():
+                try:
+                    files.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+    # The directory only changes through new or rewritten files, so newest mtime + count identify its state.
+    stamp = (max((m for m, _ in files), default=0), len(files))
+    cache_key = (str(d), limit)
+    cached = _CONTEXT_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    blocks: list[list[str]] = []
+    for mtime, p in heapq.nlargest(limit, files):
+        cached_lines = _LINE_CACHE.get(p)
+        if cached_lines is not None and cached_lines[0] == mtime:
+            blocks.append(cached_lines[1])
+            continue
         try:
             with open(p) as f:
-                records.append(json.load(f))
+                lines = _format_record(json.load(f))
         except Exception as e:
             logger.debug("Skip threat file %s: %s", p, e)
-        if len(records) >= limit:
-            break
-    if not records:
-        return ""
+            continue
+        _LINE_CACHE[p] = (mtime, lines)
+        blocks.append(lines)
+    live = {p for _, p in files}
+    # Loads run in worker threads; iterate a snapshot (list() copies the keys without releasing the GIL).
+    for stale in [p for p in list(_LINE_CACHE) if p not in live and os.path.dirname(p) == str(d)]:
+        _LINE_CACHE.pop(stale, None)
+    text = ""
+    if blocks:
+        header = ["Previous threats and resolutions (use for similar cases):", ""]
+        text = "\n".join(itertools.chain(header, itertools.chain.from_iterable(blocks)))
+    _CONTEXT_CACHE[cache_key] = (stamp, text)
+    return text
+
+
+async def load_threats_for_context_async(config: dict[str, Any], limit: int = 20) -> str:
+    """load_threats_for_context in a worker thread (directory scan and JSON parsing block)."""
+    return await asyncio.to_thread(load_threats_for_context, config, limit)
+
+
+def _format_record(r: dict[str, Any]) -> list[str]:
     lines = [
-        "Previous threats and resolutions (use for similar cases):",
-        "",
+        f"- [{r.get('severity', '')}] {r.get('title', '')}",
+        f"  Description: {r.get('description', '')[:300]}",
     ]
-    for r in records:
-        lines.append(f"- [{r.get('severity', '')}] {r.get('title', '')}")
-        lines.append(f"  Description: {r.get('description', '')[:300]}")
-        if r.get("resolution_actions"):
-            lines.append("  Resolved by: " + "; ".join(r["resolution_actions"][:5]))
-        lines.append("")
-    return "\n".join(lines)
+    if r.get("resolution_actions"):
+        lines.append("  Resolved by: " + "; ".join(r["resolution_actions"][:5]))
+    lines.append("")
+    return lines
@@ -28,9 +28,9 @@ import sys
 import time
 
 
-def _burn_cpu(_: object) -> None:
-    """Use one core at 100% (tight loop)."""
-    while True:
+def _burn_cpu(until: float) -> None:
+    """Use one core at 100% (tight loop) until the monotonic deadline."""
+    while time.monotonic() < until:
         pass
 
 
@@ -40,19 +40,27 @@ def run_cpu_stress(duration_sec: int = 120, num_workers: int | None = None) -> N
     print(f"Simulating high CPU: {n} workers for {duration_sec}s (PID {os.getpid()})")
     print("OpenSecAgent should detect high_cpu and may run the LLM agent to kill this process.")
     print("Press Ctrl+C to stop early.\n")
-    procs = [multiprocessing.Process(target=_burn_cpu, args=(None,)) for _ in range(n)]
+    # Independent processes, not a pool: killing one burner (what the agent is expected to do) must
+    # leave the others running. Each returns on its own at the deadline; Ctrl+C reaches them too.
+    until = time.monotonic() + duration_sec
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_burn_cpu, args=(until,)) for _ in range(n)]
     for p in procs:
         p.start()
     try:
-        time.sleep(duration_sec)
+        for p in procs:
+            p.join()
+            if p.exitcode and p.exitcode < 0:
+                print(f"Worker PID {p.pid} was killed by signal {-p.exitcode}.")
     except KeyboardInterrupt:
         print("\nStopped.")
     finally:
         for p in procs:
-            p.terminate()
-            p.join(timeout=2)
             if p.is_alive():
-                p.kill()
+                p.terminate()
+                p.join(timeout=2)
+                if p.is_alive():
+                    p.kill()
         print("Simulation ended.")
 
 
@@ -0,0 +1,45 @@
+# OpenSecAgent - JSONL logger tests
+import asyncio
+import json
+
+from opensecagent.reporter.activity import ActivityLogger
+from opensecagent.reporter.audit import AuditLogger
+from opensecagent.reporter.jsonl import JsonlWriter
+
+
+def test_activity_and_audit_records_written_in_order(tmp_path):
+    async def run() -> None:
+        activity = ActivityLogger({"activity": {"file": str(tmp_path / "activity.jsonl")}})
+        audit = AuditLogger({"file": str(tmp_path / "audit.jsonl")})
+        await activity.start()
+        await audit.start()
+        for i in range(120):
+            activity.log_detector_run("manager", i, [], 0.0)
+        await asyncio.sleep(0)
+        audit.log_action("stop_container", {"container_id": "c1"}, "inc-1")
+        await audit.stop()
+        await activity.stop()
+
+    asyncio.run(run())
+    rows = [json.loads(line) for line in (tmp_path / "activity.jsonl").read_text().splitlines()]
+    assert [r["events_found"] for r in rows] == list(range(120))
+    assert all(r["type"] == "detector_run" and r["ts"].endswith("Z") for r in rows)
+    audit_rows = [json.loads(line) for line in (tmp_path / "audit.jsonl").read_text().splitlines()]
+    assert audit_rows[0]["action"] == "stop_container"
+    assert audit_rows[0]["incident_id"] == "inc-1"
+
+
+def test_oversized_line_and_rest_of_batch_survive_stop(tmp_path):
+    async def run() -> None:
+        writer = JsonlWriter(tmp_path / "big.jsonl")
+        await writer.start()
+        writer.put({"i": 0, "blob": "x" * 10_000})
+        for i in range(1, 11):
+            writer.put({"i": i})
+        await asyncio.sleep(0)
+        await writer.stop()
+
+    asyncio.run(run())
+    rows = [json.loads(line) for line in (tmp_path / "big.jsonl").read_text().splitlines()]
+    assert [r["i"] for r in rows] == list(range(11))
+    assert len(rows[0]["blob"]) == 10_000
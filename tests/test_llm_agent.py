@@ -0,0 +1,101 @@
+# OpenSecAgent - LLM agent command parsing / whitelist tests
+import asyncio
+import json
+import sys
+
+from opensecagent.llm_advisor import compile_redact_patterns, redact
+from opensecagent.llm_agent import (
+    _OUTPUT_CAP_BYTES,
+    LLMAgent,
+    _bounded_dumps,
+    _trim_history,
+    is_command_allowed,
+    parse_llm_commands,
+)
+
+
+def test_is_command_allowed():
+    assert is_command_allowed("docker ps -a") is True
+    assert is_command_allowed("  WHOAMI  ") is True
+    assert is_command_allowed("kill -9 123 456") is True
+    assert is_command_allowed("kill -9 123; rm -rf /") is False
+    assert is_command_allowed("rm -rf /") is False
+    assert is_command_allowed("# docker ps") is False
+    assert is_command_allowed("") is False
+
+
+def test_parse_llm_commands_json():
+    response = 'Sure:\n{"commands": [{"cmd": "docker ps", "reason": "list"}, "whoami"], "done": false}'
+    commands, done, finding = parse_llm_commands(response)
+    assert commands == [{"cmd": "docker ps", "reason": "list"}, {"cmd": "whoami", "reason": ""}]
+    assert done is False
+    assert finding is None
+
+
+def test_parse_llm_commands_markdown():
+    response = "Run these:\n```bash\n# comment\nss -tlnp\nwhoami\n```"
+    commands, done, _ = parse_llm_commands(response)
+    assert [c["cmd"] for c in commands] == ["ss -tlnp", "whoami"]
+    assert done is False
+
+
+def test_redact():
+    pattern_re = compile_redact_patterns(["hunter2", "Token"])
+    out = redact("pass hunter2 and TOKEN here; api_key=abc123", pattern_re)
+    assert "hunter2" not in out
+    assert "TOKEN" not in out
+    assert "abc123" not in out
+    assert redact("nothing to hide", None) == "nothing to hide"
+
+
+def test_parse_llm_commands_skips_stray_braces():
+    response = 'Note {not json}. {"commands": [], "done": true, "vulnerability_found": true, "finding": {"title": "t"}} trailing }'
+    commands, done, finding = parse_llm_commands(response)
+    assert commands == []
+    assert done is True
+    assert finding == {"title": "t"}
+
+
+def test_bounded_dumps_matches_truncated_dumps():
+    obj = {"host": {"packages": [{"name": f"pkg{i}", "version": "1.0"} for i in range(500)]}}
+    assert _bounded_dumps(obj, 8000) == json.dumps(obj, indent=2)[:8000]
+    assert _bounded_dumps({"a": 1}, 8000) == json.dumps({"a": 1}, indent=2)
+
+
+def test_trim_history_keeps_context_and_recent_turns():
+    messages = [{"role": "system", "content": "s"}, {"role": "user", "content": "ctx"}]
+    for i in range(6):
+        messages += [
+            {"role": "assistant", "content": f"a{i}"},
+            {"role": "user", "content": f"r{i}"},
+            {"role": "user", "content": "next"},
+        ]
+    trimmed = _trim_history(messages, 12)
+    assert trimmed[:2] == messages[:2]
+    assert len(trimmed) <= 12
+    assert trimmed[2]["role"] == "assistant"
+    assert trimmed[-3:] == messages[-3:]
+
+
+def test_execute_command_caps_output():
+    agent = LLMAgent({})
+    result = asyncio.run(agent._execute_command(f"{sys.executable} -c \"print('x' * 100000)\""))
+    assert result["exit_code"] == 0
+    assert result["stdout"] == "x" * _OUTPUT_CAP_BYTES
+
+
+def test_execute_command_timeout_kills_and_reaps(monkeypatch):
+    procs = []
+    spawn = asyncio.create_subprocess_exec
+
+    async def tracking_spawn(*args, **kwargs):
+        proc = await spawn(*args, **kwargs)
+        procs.append(proc)
+        return proc
+
+    monkeypatch.setattr(asyncio, "create_subprocess_exec", tracking_spawn)
+    agent = LLMAgent({"llm_agent": {"command_timeout_sec": 0.2}})
+    result = asyncio.run(agent._execute_command("sleep 5"))
+    assert result["exit_code"] == -1
+    assert "timed out" in result["stderr"]
+    assert procs[0].returncode is not None
@@ -1,5 +1,5 @@
 # OpenSecAgent - Model tests
-from opensecagent.models import Severity, Incident, Event, severity_from_str
+from opensecagent.models import Severity, Incident, Event, severity_from_str, stable_event_id
 
 
 def test_severity_from_str():
@@ -16,3 +16,32 @@ def test_incident_event_type_matches():
     )
     assert inc.event_type_matches("config_drift") is True
     assert inc.event_type_matches("auth_failures") is False
+
+
+def test_stable_event_id():
+    a = stable_event_id("new-admin", sorted({"bob", "alice"}))
+    assert a == stable_event_id("new-admin", ["alice", "bob"])
+    assert a != stable_event_id("new-admin", ["alice"])
+    assert a.startswith("new-admin-")
+
+
+def test_event_batch_shares_timestamp():
+    events = Event.batch("detector.ports", "new_listening_port", [
+        {"event_id": "a", "severity": "P3", "summary": "s1", "raw": {}},
+        {"event_id": "b", "summary": "s2", "raw": {"x": 1}},
+    ])
+    assert [e.event_id for e in events] == ["a", "b"]
+    assert events[0].severity == Severity.P3 and events[1].severity == Severity.P4
+    assert events[0].ts is events[1].ts
+
+
+def test_incident_to_dict_is_cached():
+    ev = Event("e1", "drift", "config_drift", Severity.P2, "summary", {})
+    inc = Incident("inc-1", Severity.P2, "Title", "Narrative", [ev], {"k": "v"}, ["Review"])
+    d = inc.to_dict()
+    assert d["severity"] == "P2"
+    assert d["events"] == [{"event_id": "e1", "source": "drift", "event_type": "config_drift", "summary": "summary"}]
+    inc.actions_taken.append("Stopped container c1")
+    assert inc.to_dict() is d
+    assert d["actions_taken"] == ["Stopped container c1"]
+    assert d["events"] is inc.events_as_dicts()
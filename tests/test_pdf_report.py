@@ -0,0 +1,50 @@
+# OpenSecAgent - PDF report tests
+import pytest
+
+from opensecagent.reporter import pdf_report
+from opensecagent.reporter.pdf_report import generate_vulnerability_pdf, generate_vulnerability_pdf_batch
+
+pytest.importorskip("reportlab")
+
+
+def test_markup_in_finding_fields_is_escaped(tmp_path):
+    finding = {"title": "<script> & co", "severity": "P1", "description": "a < b", "evidence": {"k<": "v&"}}
+    path = generate_vulnerability_pdf(finding, "thr-<1>", tmp_path / "x.pdf", {"hostname": "h&<"})
+    assert path.read_bytes().startswith(b"%PDF")
+
+
+def test_unchanged_inputs_reuse_existing_pdf(tmp_path, monkeypatch):
+    builds = []
+    new_doc = pdf_report._new_doc
+
+    def counting_new_doc(rl, path):
+        builds.append(path)
+        return new_doc(rl, path)
+
+    monkeypatch.setattr(pdf_report, "_new_doc", counting_new_doc)
+    finding = {"title": "Open port", "severity": "P3", "evidence": {"port": 8080}}
+    out = tmp_path / "r.pdf"
+    generate_vulnerability_pdf(finding, "thr-1", out)
+    assert (tmp_path / "r.pdf.sha").exists()
+    generate_vulnerability_pdf(dict(finding), "thr-1", out)
+    assert len(builds) == 1
+    generate_vulnerability_pdf({**finding, "severity": "P2"}, "thr-1", out)
+    assert len(builds) == 2
+    out.unlink()
+    generate_vulnerability_pdf({**finding, "severity": "P2"}, "thr-1", out)
+    assert len(builds) == 3 and out.exists()
+
+
+def test_batch_manifest_page_ranges(tmp_path):
+    findings = [
+        ({"title": "Short", "severity": "P3"}, "thr-a"),
+        ({"title": "Long", "severity": "P2", "description": "line\n" * 150}, "thr-b"),
+        ({"title": "Last", "severity": "P4"}, "thr-c"),
+    ]
+    path, manifest = generate_vulnerability_pdf_batch(findings, tmp_path / "batch.pdf")
+    assert path.read_bytes().startswith(b"%PDF")
+    assert [m["threat_id"] for m in manifest] == ["thr-a", "thr-b", "thr-c"]
+    assert manifest[0] == {"threat_id": "thr-a", "first_page": 1, "last_page": 1}
+    assert manifest[1]["first_page"] == 2 and manifest[1]["last_page"] > 2
+    assert manifest[2]["first_page"] == manifest[1]["last_page"] + 1
+    assert manifest[2]["last_page"] == manifest[2]["first_page"]
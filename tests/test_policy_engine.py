@@ -0,0 +1,60 @@
+# OpenSecAgent - Policy engine tests
+from datetime import datetime, timedelta, timezone
+
+from opensecagent.models import Event, Incident, Severity
+from opensecagent.policy_engine import PolicyEngine
+
+
+def _incident(event_type: str, severity: Severity = Severity.P2) -> Incident:
+    ev = Event("e1", "detector", event_type, severity, "summary", {})
+    return Incident("inc-1", severity, "Title", "Narrative", [ev], {}, [])
+
+
+def test_maintenance_window_with_z_and_offset_contains_now():
+    now = datetime.now(timezone.utc)
+    start = (now - timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
+    end = (now + timedelta(hours=1)).astimezone(timezone(timedelta(hours=2))).isoformat()
+    engine = PolicyEngine({"action_tier_max": 1, "maintenance_windows": [{"start": start, "end": end}]})
+    assert engine.allowed_actions(_incident("new_container")) == [
+        {"action": "alert_only", "reason": "maintenance_window"}
+    ]
+
+
+def test_naive_maintenance_window_is_utc():
+    now = datetime.utcnow()
+    window = {"start": (now - timedelta(minutes=5)).isoformat(), "end": (now + timedelta(minutes=5)).isoformat()}
+    assert PolicyEngine({"maintenance_windows": [window]})._in_maintenance_window() is True
+    past = {"start": (now - timedelta(hours=2)).isoformat(), "end": (now - timedelta(hours=1)).isoformat()}
+    assert PolicyEngine({"maintenance_windows": [past]})._in_maintenance_window() is False
+
+
+def test_malformed_maintenance_window_is_skipped():
+    now = datetime.utcnow()
+    good = {"start": (now - timedelta(minutes=5)).isoformat(), "end": (now + timedelta(minutes=5)).isoformat()}
+    engine = PolicyEngine({"maintenance_windows": [{"start": "not-a-date", "end": "2030-01-01T00:00:00"}, good]})
+    assert len(engine._parsed_windows) == 1
+    assert engine._in_maintenance_window() is True
+
+
+def test_allowed_actions_by_tier_and_event_type():
+    engine = PolicyEngine({"action_tier_max": 1})
+    container = engine.allowed_actions(_incident("new_container"))
+    assert [a["action"] for a in container] == ["alert_only", "stop_container"]
+    auth = engine.allowed_actions(_incident("auth_failures", Severity.P1))
+    assert [a["action"] for a in auth] == ["alert_only", "block_ip_temporary"]
+    assert [a["action"] for a in engine.allowed_actions(_incident("auth_failures", Severity.P3))] == ["alert_only"]
+    assert [a["action"] for a in engine.allowed_actions(_incident("config_drift"))] == ["alert_only"]
+    alert_only = PolicyEngine({"action_tier_max": 0})
+    assert [a["action"] for a in alert_only.allowed_actions(_incident("new_container"))] == ["alert_only"]
+
+
+def test_time_only_window_repeats_daily():
+    now = datetime.utcnow()
+    window = {"start": (now - timedelta(minutes=5)).strftime("%H:%M"), "end": (now + timedelta(minutes=5)).strftime("%H:%M")}
+    engine = PolicyEngine({"action_tier_max": 1, "maintenance_windows": [window]})
+    assert engine._parsed_windows == [] and len(engine._daily_windows) == 1
+    assert engine._in_maintenance_window() is True
+    later = {"start": (now + timedelta(hours=2)).strftime("%H:%M"), "end": (now + timedelta(hours=3)).strftime("%H:%M")}
+    assert PolicyEngine({"maintenance_windows": [later]})._in_maintenance_window() is False
+    mixed = {"start": "02:00", "end": (now + timedelta(days=1)).isoformat()}
+    assert PolicyEngine({"maintenance_windows": [mixed]})._daily_windows == []
@@ -0,0 +1,36 @@
+# OpenSecAgent - Resource detector tests
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from opensecagent.detector.resources import ResourceDetector
+
+psutil = pytest.importorskip("psutil")
+
+
+def test_fresh_detector_measures_a_real_cpu_window():
+    stop = threading.Event()
+
+    def burn() -> None:
+        while not stop.is_set():
+            pass
+
+    threads = [threading.Thread(target=burn) for _ in range(psutil.cpu_count() or 1)]
+    for t in threads:
+        t.start()
+    try:
+        detector = ResourceDetector({"detector": {"resource_cpu_percent": 50, "resource_memory_percent": 101}})
+        t0 = time.monotonic()
+        events = asyncio.run(detector.check())
+        elapsed = time.monotonic() - t0
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+    assert elapsed >= 0.9
+    [event] = events
+    assert event["event_type"] == "high_cpu"
+    assert os.getpid() in {p["pid"] for p in event["raw"]["top_processes"]}
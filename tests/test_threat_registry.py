@@ -0,0 +1,22 @@
+# OpenSecAgent - Threat registry tests
+from opensecagent import threat_registry
+from opensecagent.threat_registry import ThreatWriter, load_threats_for_context, mark_resolved, store_threat
+
+
+def test_load_threats_for_context_tracks_changes(tmp_path):
+    config = {"threat_registry": {"dir": str(tmp_path / "threats")}}
+    assert load_threats_for_context(config) == ""
+    threat_id = store_threat(config, "Miner in container", "High CPU", "P2", {"pid": 1})
+    first = load_threats_for_context(config)
+    assert "[P2] Miner in container" in first
+    assert load_threats_for_context(config) is first
+    mark_resolved(config, threat_id, ["docker stop abc"])
+    assert "Resolved by: docker stop abc" in load_threats_for_context(config)
+
+
+def test_unstarted_threat_writer_fsyncs_immediately(tmp_path, monkeypatch):
+    synced: list[set] = []
+    monkeypatch.setattr(threat_registry, "_fsync_paths", synced.append)
+    config = {"agent": {"data_dir": str(tmp_path)}}
+    threat_id = store_threat(config, "t", "d", "P2", {}, writer=ThreatWriter())
+    assert synced == [{tmp_path / "threats" / f"{threat_id}.json"}]